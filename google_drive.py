@@ -12,8 +12,10 @@ This module manages all Google Drive operations including:
 - Temporary file cleanup
 """
 
+import asyncio
 import os
 import logging
+import threading
 from typing import Optional, Dict, Any
 from google.auth.transport.requests import Request
 from google.oauth2 import service_account
@@ -65,8 +67,29 @@ class GoogleDriveService:
     """Google Drive service class for handling authentication and basic operations"""
     
     def __init__(self):
-        self.service = None
+        # The googleapiclient client and its httplib2.Http are not thread-safe
+        # and uploads run in asyncio.to_thread workers, so each thread gets
+        # its own client built from the shared credentials
+        self._local = threading.local()
+        self._generation = 0
         self.credentials = None
+        self.service = None
+    
+    @property
+    def service(self):
+        """Drive API client for the calling thread, or None before authentication"""
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.service = build('drive', 'v3', credentials=self.credentials) if self.credentials else None
+            local.generation = self._generation
+        return local.service
+    
+    @service.setter
+    def service(self, value):
+        # A new client means new credentials; other threads rebuild theirs
+        self._generation += 1
+        self._local.service = value
+        self._local.generation = self._generation
         
     @retry_google_api(max_retries=2)
     def authenticate_google_drive(self) -> bool:
@@ -303,6 +326,8 @@ from typing import Dict, Optional
 
 # Folder ID cache to avoid repeated API calls
 _folder_cache: Dict[str, str] = {}
+# Serializes find-or-create so concurrent uploads do not create duplicate folders
+_folder_lock = threading.Lock()
 
 def get_current_month_folder_name() -> str:
     """
@@ -409,17 +434,22 @@ def get_or_create_folder(name: str, parent_id: Optional[str] = None) -> Optional
         logger.info(f"Using cached folder ID for '{name}': {_folder_cache[cache_key]}")
         return _folder_cache[cache_key]
     
-    # Try to find existing folder
-    folder_id = find_folder_by_name(name, parent_id)
-    
-    # Create if not found
-    if not folder_id:
-        folder_id = create_folder(name, parent_id)
-    
-    # Cache the result
-    if folder_id:
-        _folder_cache[cache_key] = folder_id
-        logger.info(f"Cached folder ID for '{name}': {folder_id}")
+    with _folder_lock:
+        # Another upload may have cached it while we waited for the lock
+        if cache_key in _folder_cache:
+            return _folder_cache[cache_key]
+        
+        # Try to find existing folder
+        folder_id = find_folder_by_name(name, parent_id)
+        
+        # Create if not found
+        if not folder_id:
+            folder_id = create_folder(name, parent_id)
+        
+        # Cache the result
+        if folder_id:
+            _folder_cache[cache_key] = folder_id
+            logger.info(f"Cached folder ID for '{name}': {folder_id}")
     
     return folder_id
 
@@ -502,12 +532,13 @@ def get_folder_cache_info() -> Dict[str, str]:
     return _folder_cache.copy()
 
 # Photo upload functionality with memory management
-import gc
 import tempfile
 from io import BytesIO
 from googleapiclient.http import MediaIoBaseUpload
 
-@retry_google_api(max_retries=3)
+# Resumable upload chunk size: the media body is read and sent this many bytes at a time
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
 def upload_photo(file_data: bytes, filename: str, folder_type: str, year: int = None, month: int = None, user_id: Optional[int] = None) -> Optional[str]:
     """
     Upload photo to Google Drive with memory-efficient handling
@@ -523,8 +554,27 @@ def upload_photo(file_data: bytes, filename: str, folder_type: str, year: int =
     Returns:
         Optional[str]: Public link to uploaded photo if successful, None otherwise
     """
-    file_stream = None
+    return upload_photo_stream(BytesIO(file_data), filename, folder_type, year, month, user_id)
+
+@retry_google_api(max_retries=3)
+def upload_photo_stream(file_stream: BytesIO, filename: str, folder_type: str, year: int = None, month: int = None, user_id: Optional[int] = None) -> Optional[str]:
+    """
+    Upload photo to Google Drive from an in-memory stream, in resumable chunks
+    
+    The stream is uploaded directly (no intermediate bytes copy) and closed
+    after a successful upload.
     
+    Args:
+        file_stream (BytesIO): Photo data stream
+        filename (str): Name for the uploaded file
+        folder_type (str): Either 'meetups' or 'sales'
+        year (int, optional): Year for folder structure. Defaults to current year.
+        month (int, optional): Month for folder structure. Defaults to current month.
+        user_id (int, optional): User ID for error context
+        
+    Returns:
+        Optional[str]: Public link to uploaded photo if successful, None otherwise
+    """
     with ErrorContext("photo_upload", user_id, "file_processing_error") as ctx:
         if not drive_service.service:
             error_msg = "Google Drive service not initialized"
@@ -551,8 +601,8 @@ def upload_photo(file_data: bytes, filename: str, folder_type: str, year: int =
             log_system_event("upload_failed", error_msg, "ERROR")
             return None
         
-        # Create BytesIO stream from file data
-        file_stream = BytesIO(file_data)
+        # Start from the beginning of the stream (also on a retried attempt)
+        file_stream.seek(0)
         
         # Prepare file metadata
         file_metadata = {
@@ -564,6 +614,7 @@ def upload_photo(file_data: bytes, filename: str, folder_type: str, year: int =
         media = MediaIoBaseUpload(
             file_stream,
             mimetype='image/jpeg',  # Assuming JPEG images
+            chunksize=UPLOAD_CHUNK_SIZE,
             resumable=True
         )
         
@@ -589,7 +640,7 @@ def upload_photo(file_data: bytes, filename: str, folder_type: str, year: int =
         log_system_event("photo_upload_success", f"User {user_id} uploaded {filename} successfully")
         
         # Immediate memory cleanup after successful upload
-        release_file_memory(file_data, file_stream)
+        release_file_memory(None, file_stream)
         
         return public_link
 
@@ -687,22 +738,13 @@ async def upload_photo_from_telegram(telegram_file, filename: str, folder_type:
     try:
         logger.info(f"Processing Telegram file for upload: {filename}")
         
-        # Download file data from Telegram with memory-efficient handling
-        file_data = await telegram_file.download_as_bytearray()
-        
-        # Convert to bytes and upload
-        file_bytes = bytes(file_data)
+        # Download straight into one stream and upload from it in chunks,
+        # instead of holding a bytearray plus a bytes copy of the photo
+        file_stream = BytesIO()
+        await telegram_file.download_to_memory(file_stream)
         
-        # Upload the photo
-        result = upload_photo(file_bytes, filename, folder_type, year, month)
-        
-        # Clean up the downloaded data immediately
-        del file_data
-        del file_bytes
-        gc.collect()
-        logger.info("[MEMORY] Cleaned up Telegram file data after processing")
-        
-        return result
+        # Upload the photo (blocking Drive API calls run in a worker thread)
+        return await asyncio.to_thread(upload_photo_stream, file_stream, filename, folder_type, year, month)
         
     except Exception as e:
         logger.error(f"Failed to process Telegram file {filename}: {e}")
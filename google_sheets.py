@@ -14,6 +14,7 @@ This module manages all Google Sheets operations including:
 
 import os
 import logging
+import threading
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from google.auth.transport.requests import Request
@@ -68,8 +69,29 @@ class GoogleSheetsService:
     """Google Sheets service class for handling authentication and basic operations"""
     
     def __init__(self):
-        self.service = None
+        # The googleapiclient client and its httplib2.Http are not thread-safe
+        # and Sheets calls run in asyncio.to_thread workers, so each thread
+        # gets its own client built from the shared credentials
+        self._local = threading.local()
+        self._generation = 0
         self.credentials = None
+        self.service = None
+    
+    @property
+    def service(self):
+        """Sheets API client for the calling thread, or None before authentication"""
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.service = build('sheets', 'v4', credentials=self.credentials) if self.credentials else None
+            local.generation = self._generation
+        return local.service
+    
+    @service.setter
+    def service(self, value):
+        # A new client means new credentials; other threads rebuild theirs
+        self._generation += 1
+        self._local.service = value
+        self._local.generation = self._generation
         
     @retry_google_api(max_retries=2)
     def authenticate_google_sheets(self) -> bool:
@@ -368,6 +390,74 @@ def register_user(user_data: Dict[str, Any]) -> bool:
         log_system_event("user_registered", f"User {user_id} ({user_data['name']}) registered successfully")
         return True
 
+@retry_google_api(max_retries=3)
+def register_users_batch(users: List[Dict[str, Any]]) -> List[bool]:
+    """
+    Store several new user registrations in Google Sheets with a single append
+    
+    Duplicate registrations (already in the sheet, or repeated within the
+    batch) are skipped. Errors from the Sheets API are raised to the caller.
+    
+    Args:
+        users (list): User data dictionaries, as accepted by register_user
+        
+    Returns:
+        list: One bool per input user, True if that user was registered
+    """
+    with ErrorContext("user_registration_batch", None, "database_error") as ctx:
+        if not sheets_service.service:
+            error_msg = "Google Sheets service not initialized"
+            logger.error(error_msg)
+            log_system_event("registration_failed", error_msg, "ERROR")
+            return [False] * len(users)
+        
+        # Check if Users sheet exists, create if not
+        _ensure_sheet_exists(USERS_SHEET, [
+            'User ID', 'Name', 'Nationality', 'Phone', 'Upline', 'Registration Date', 'Role'
+        ])
+        
+        # Read the registered user IDs once for the whole batch
+        result = sheets_service.service.spreadsheets().values().get(
+            spreadsheetId=SPREADSHEET_ID,
+            range=f"'{USERS_SHEET}'!A:A"
+        ).execute()
+        registered_ids = {str(row[0]) for row in result.get('values', [])[1:] if row}
+        
+        values = []
+        results = []
+        for user_data in users:
+            user_id = str(user_data['user_id'])
+            if user_id in registered_ids:
+                logger.warning(f"User {user_id} already registered")
+                log_system_event("duplicate_registration_attempt", f"User {user_id} attempted duplicate registration", "WARNING")
+                results.append(False)
+                continue
+            
+            registered_ids.add(user_id)
+            values.append([
+                user_data['user_id'],
+                user_data['name'],
+                user_data['nationality'],
+                user_data['phone'],
+                user_data['upline'],
+                user_data['registration_date'],
+                user_data['role']
+            ])
+            results.append(True)
+        
+        if values:
+            sheets_service.service.spreadsheets().values().append(
+                spreadsheetId=SPREADSHEET_ID,
+                range=f"'{USERS_SHEET}'!A:G",
+                valueInputOption='RAW',
+                body={'values': values}
+            ).execute()
+            
+            logger.info(f"Registered {len(values)} users in one batch")
+            log_system_event("users_registered", f"{len(values)} users registered in one batch")
+        
+        return results
+
 def get_user_by_id(user_id: int) -> Optional[Dict[str, Any]]:
     """
     Retrieve user data by Telegram ID
@@ -776,16 +866,17 @@ def record_kpi_submission(user_id: int, record_type: str, value: Union[int, floa
             logger.error(f"Invalid record_type: {record_type}")
             return False
         
-        # Use current datetime if not provided
+        # One clock read serves as the submission time and the default record date
+        now = datetime.now()
         if record_date is None:
-            record_date = datetime.now()
+            record_date = now
         
         # Ensure KPI Records sheet exists
         _ensure_sheet_exists(RECORDS_SHEET, [
             'User ID', 'Record Date', 'Record Type', 'Value', 'Photo Link', 'Submission Date'
         ])
         
-        submission_date = datetime.now().isoformat()
+        submission_date = now.isoformat()
         record_date_str = record_date.isoformat()
         
         # Prepare data for insertion
@@ -155,13 +155,11 @@ def release_file_memory(file_data: Any, file_stream: Optional[BytesIO] = None,
                 logger.error(f"[MEMORY] Error deleting file data: {e}")
                 cleanup_success = False
         
-        # Force garbage collection
-        collected = gc.collect()
-        memory_manager.cleanup_stats['gc_collections'] += 1
+        # No forced collection here: this runs on every upload, and a full
+        # gc.collect() stalls the event loop. Reference counting frees the
+        # buffers; cyclic garbage is collected by the scheduled cleanup.
         memory_manager.cleanup_stats['last_cleanup'] = datetime.now()
         
-        logger.info(f"[MEMORY] Forced garbage collection: collected {collected} objects")
-        
         return cleanup_success
         
     except Exception as e:
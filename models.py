@@ -10,13 +10,95 @@ This module contains all data model classes for the Telegram KPI Bot:
 Each model includes validation methods to ensure data integrity.
 """
 
+import calendar
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Union, Optional
-import re
-import logging
 
-logger = logging.getLogger(__name__)
+# Characters allowed in a phone number: digits, spaces, +, -, (, )
+_PHONE_CHARS = frozenset("0123456789 +-()")
+
+# Stripped length bounds for validated string fields
+_NAME_MIN, _NAME_MAX = 2, 100
+_NATIONALITY_MIN, _NATIONALITY_MAX = 2, 50
+_PHONE_MIN, _PHONE_MAX = 7, 20
+_UPLINE_MIN, _UPLINE_MAX = 2, 100
+_PHOTO_LINK_MAX = 500
+
+# Allowed values for User.role and KPIRecord.record_type
+_ROLES = frozenset(('admin', 'sales'))
+_RECORD_TYPES = frozenset(('meetup', 'sale'))
+
+# Exact numeric types accepted by validators (bool is deliberately excluded)
+_NUMERIC_TYPES = frozenset((int, float))
+
+# URL schemes accepted for photo links
+_URL_SCHEMES = ('http://', 'https://')
+
+# Reads KPIRecord.value so record sums run in C via map() rather than a generator
+_record_value = attrgetter('value')
+
+
+def _sum_values(records: Optional[list]) -> Union[int, float]:
+    """Sum the value of every record in the list (0 for None or empty)"""
+    return sum(map(_record_value, records or ()))
+
+
+def _calc_pct(current: Union[int, float], target: Union[int, float]) -> float:
+    """Completion percentage of current against target, capped at 100"""
+    if target <= 0:
+        return 0.0
+    return min(current / target * 100.0, 100.0)
+
+# Set while constructing models from trusted, already-validated storage; a
+# ContextVar so concurrent tasks and worker threads each see their own value
+_SKIP: ContextVar[bool] = ContextVar('models_skip_validation', default=False)
+
+
+@contextmanager
+def _skip_validation():
+    """Skip __post_init__ validation for models constructed inside the block"""
+    token = _SKIP.set(True)
+    try:
+        yield
+    finally:
+        _SKIP.reset(token)
+
+
+# Epoch for stored integer datetimes; naive datetimes are treated as UTC wall
+# time so the encoding does not depend on the host's local timezone or DST
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _encode_datetime(value: datetime) -> Union[int, str]:
+    """
+    Encode a datetime for storage
+    
+    Naive datetimes become integer UNIX microseconds, taken as UTC wall time
+    so they decode back to the same naive value on any host. Aware datetimes
+    stay ISO 8601 strings so their UTC offset survives the round trip.
+    """
+    if value.tzinfo is not None:
+        return value.isoformat()
+    return calendar.timegm(value.utctimetuple()) * 1_000_000 + value.microsecond
+
+
+def _decode_datetime(value):
+    """
+    Decode a stored datetime
+    
+    Accepts integer UNIX microseconds and ISO 8601 strings, as written by
+    to_dict() for naive and aware datetimes and by rows stored before the
+    integer format. Anything else is returned unchanged.
+    """
+    if type(value) is int:
+        return _EPOCH + timedelta(microseconds=value)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
 
 
 @dataclass
@@ -43,7 +125,8 @@ class User:
     
     def __post_init__(self):
         """Validate data after initialization"""
-        self.validate()
+        if not _SKIP.get():
+            self.validate()
     
     def validate(self) -> bool:
         """
@@ -55,61 +138,79 @@ class User:
         Raises:
             ValueError: If validation fails
         """
+        now = datetime.now()
+        
         # Validate user_id
-        if not isinstance(self.user_id, int) or self.user_id <= 0:
+        if type(self.user_id) is not int or self.user_id <= 0:
             raise ValueError("user_id must be a positive integer")
         
         # Validate name
-        if not isinstance(self.name, str) or not self.name.strip():
+        name = self.name
+        if type(name) is not str:
+            raise ValueError("name must be a non-empty string")
+        name = name.strip()
+        n = len(name)
+        if not n:
             raise ValueError("name must be a non-empty string")
-        if len(self.name.strip()) < 2:
-            raise ValueError("name must be at least 2 characters long")
-        if len(self.name.strip()) > 100:
-            raise ValueError("name must be less than 100 characters")
+        if n < _NAME_MIN:
+            raise ValueError(f"name must be at least {_NAME_MIN} characters long")
+        if n > _NAME_MAX:
+            raise ValueError(f"name must be less than {_NAME_MAX} characters")
         
         # Validate nationality
-        if not isinstance(self.nationality, str) or not self.nationality.strip():
+        nationality = self.nationality
+        if type(nationality) is not str:
             raise ValueError("nationality must be a non-empty string")
-        if len(self.nationality.strip()) < 2:
-            raise ValueError("nationality must be at least 2 characters long")
-        if len(self.nationality.strip()) > 50:
-            raise ValueError("nationality must be less than 50 characters")
+        nationality = nationality.strip()
+        n = len(nationality)
+        if not n:
+            raise ValueError("nationality must be a non-empty string")
+        if n < _NATIONALITY_MIN:
+            raise ValueError(f"nationality must be at least {_NATIONALITY_MIN} characters long")
+        if n > _NATIONALITY_MAX:
+            raise ValueError(f"nationality must be less than {_NATIONALITY_MAX} characters")
         
         # Validate phone
-        if not isinstance(self.phone, str) or not self.phone.strip():
+        phone = self.phone
+        if type(phone) is not str:
+            raise ValueError("phone must be a non-empty string")
+        phone = phone.strip()
+        n = len(phone)
+        if not n:
             raise ValueError("phone must be a non-empty string")
         # Basic phone validation - should contain only digits, spaces, +, -, (, )
-        phone_pattern = r'^[\d\s\+\-\(\)]+$'
-        if not re.match(phone_pattern, self.phone.strip()):
+        if not _PHONE_CHARS.issuperset(phone):
             raise ValueError("phone contains invalid characters")
-        if len(self.phone.strip()) < 7:
-            raise ValueError("phone must be at least 7 characters long")
-        if len(self.phone.strip()) > 20:
-            raise ValueError("phone must be less than 20 characters")
+        if n < _PHONE_MIN:
+            raise ValueError(f"phone must be at least {_PHONE_MIN} characters long")
+        if n > _PHONE_MAX:
+            raise ValueError(f"phone must be less than {_PHONE_MAX} characters")
         
         # Validate upline
-        if not isinstance(self.upline, str) or not self.upline.strip():
+        upline = self.upline
+        if type(upline) is not str:
             raise ValueError("upline must be a non-empty string")
-        if len(self.upline.strip()) < 2:
-            raise ValueError("upline must be at least 2 characters long")
-        if len(self.upline.strip()) > 100:
-            raise ValueError("upline must be less than 100 characters")
+        upline = upline.strip()
+        n = len(upline)
+        if not n:
+            raise ValueError("upline must be a non-empty string")
+        if n < _UPLINE_MIN:
+            raise ValueError(f"upline must be at least {_UPLINE_MIN} characters long")
+        if n > _UPLINE_MAX:
+            raise ValueError(f"upline must be less than {_UPLINE_MAX} characters")
         
         # Validate registration_date
         if not isinstance(self.registration_date, datetime):
             raise ValueError("registration_date must be a datetime object")
-        if self.registration_date > datetime.now():
+        if self.registration_date > now:
             raise ValueError("registration_date cannot be in the future")
         
         # Validate role
-        if not isinstance(self.role, str) or self.role not in ['admin', 'sales']:
+        if type(self.role) is not str or self.role not in _ROLES:
             raise ValueError("role must be either 'admin' or 'sales'")
         
         # Clean up string fields
-        self.name = self.name.strip()
-        self.nationality = self.nationality.strip()
-        self.phone = self.phone.strip()
-        self.upline = self.upline.strip()
+        self.name, self.nationality, self.phone, self.upline = name, nationality, phone, upline
         
         return True
     
@@ -121,18 +222,19 @@ class User:
             'nationality': self.nationality,
             'phone': self.phone,
             'upline': self.upline,
-            'registration_date': self.registration_date.isoformat(),
+            'registration_date': _encode_datetime(self.registration_date),
             'role': self.role
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'User':
-        """Create User instance from dictionary"""
-        # Convert registration_date string back to datetime
-        if isinstance(data.get('registration_date'), str):
-            data['registration_date'] = datetime.fromisoformat(data['registration_date'])
+        """Create User instance from a stored dictionary without re-validating"""
+        # Convert stored registration_date back to datetime
+        if 'registration_date' in data:
+            data['registration_date'] = _decode_datetime(data['registration_date'])
         
-        return cls(**data)
+        with _skip_validation():
+            return cls(**data)
 
 
 @dataclass
@@ -157,7 +259,8 @@ class KPITarget:
     
     def __post_init__(self):
         """Validate data after initialization"""
-        self.validate()
+        if not _SKIP.get():
+            self.validate()
     
     def validate(self) -> bool:
         """
@@ -169,26 +272,30 @@ class KPITarget:
         Raises:
             ValueError: If validation fails
         """
+        now = datetime.now()
+        
         # Validate user_id
-        if not isinstance(self.user_id, int) or self.user_id <= 0:
+        if type(self.user_id) is not int or self.user_id <= 0:
             raise ValueError("user_id must be a positive integer")
         
         # Validate month
-        if not isinstance(self.month, int) or not (1 <= self.month <= 12):
+        month = self.month
+        if type(month) is not int or month < 1 or month > 12:
             raise ValueError("month must be an integer between 1 and 12")
         
         # Validate year
-        if not isinstance(self.year, int) or not (2020 <= self.year <= 2030):
+        year = self.year
+        if type(year) is not int or year < 2020 or year > 2030:
             raise ValueError("year must be an integer between 2020 and 2030")
         
         # Validate meetup_target
-        if not isinstance(self.meetup_target, int) or self.meetup_target < 0:
+        if type(self.meetup_target) is not int or self.meetup_target < 0:
             raise ValueError("meetup_target must be a non-negative integer")
         if self.meetup_target > 1000:
             raise ValueError("meetup_target must be less than 1000")
         
         # Validate sales_target
-        if not isinstance(self.sales_target, (int, float)) or self.sales_target < 0:
+        if type(self.sales_target) not in _NUMERIC_TYPES or self.sales_target < 0:
             raise ValueError("sales_target must be a non-negative number")
         if self.sales_target > 1000000:
             raise ValueError("sales_target must be less than 1,000,000")
@@ -196,7 +303,7 @@ class KPITarget:
         # Validate created_date
         if not isinstance(self.created_date, datetime):
             raise ValueError("created_date must be a datetime object")
-        if self.created_date > datetime.now():
+        if self.created_date > now:
             raise ValueError("created_date cannot be in the future")
         
         return True
@@ -209,17 +316,18 @@ class KPITarget:
             'year': self.year,
             'meetup_target': self.meetup_target,
             'sales_target': self.sales_target,
-            'created_date': self.created_date.isoformat()
+            'created_date': _encode_datetime(self.created_date)
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'KPITarget':
-        """Create KPITarget instance from dictionary"""
-        # Convert created_date string back to datetime
-        if isinstance(data.get('created_date'), str):
-            data['created_date'] = datetime.fromisoformat(data['created_date'])
+        """Create KPITarget instance from a stored dictionary without re-validating"""
+        # Convert stored created_date back to datetime
+        if 'created_date' in data:
+            data['created_date'] = _decode_datetime(data['created_date'])
         
-        return cls(**data)
+        with _skip_validation():
+            return cls(**data)
 
 
 @dataclass
@@ -244,7 +352,8 @@ class KPIRecord:
     
     def __post_init__(self):
         """Validate data after initialization"""
-        self.validate()
+        if not _SKIP.get():
+            self.validate()
     
     def validate(self) -> bool:
         """
@@ -256,49 +365,57 @@ class KPIRecord:
         Raises:
             ValueError: If validation fails
         """
+        # Same reference time for both future-date checks
+        now = datetime.now()
+        
         # Validate user_id
-        if not isinstance(self.user_id, int) or self.user_id <= 0:
+        if type(self.user_id) is not int or self.user_id <= 0:
             raise ValueError("user_id must be a positive integer")
         
         # Validate record_date
         if not isinstance(self.record_date, datetime):
             raise ValueError("record_date must be a datetime object")
-        if self.record_date > datetime.now():
+        if self.record_date > now:
             raise ValueError("record_date cannot be in the future")
         
         # Validate record_type
-        if not isinstance(self.record_type, str) or self.record_type not in ['meetup', 'sale']:
+        if type(self.record_type) is not str or self.record_type not in _RECORD_TYPES:
             raise ValueError("record_type must be either 'meetup' or 'sale'")
         
         # Validate value based on record_type
         if self.record_type == 'meetup':
-            if not isinstance(self.value, int) or self.value <= 0:
+            if type(self.value) is not int or self.value <= 0:
                 raise ValueError("value for meetup must be a positive integer (client count)")
             if self.value > 100:
                 raise ValueError("meetup client count must be less than 100")
         elif self.record_type == 'sale':
-            if not isinstance(self.value, (int, float)) or self.value <= 0:
+            if type(self.value) not in _NUMERIC_TYPES or self.value <= 0:
                 raise ValueError("value for sale must be a positive number (sales amount)")
             if self.value > 100000:
                 raise ValueError("sales amount must be less than 100,000")
         
         # Validate photo_link
-        if not isinstance(self.photo_link, str) or not self.photo_link.strip():
+        photo_link = self.photo_link
+        if type(photo_link) is not str:
+            raise ValueError("photo_link must be a non-empty string")
+        photo_link = photo_link.strip()
+        n = len(photo_link)
+        if not n:
             raise ValueError("photo_link must be a non-empty string")
         # Basic URL validation
-        if not (self.photo_link.startswith('http://') or self.photo_link.startswith('https://')):
+        if not photo_link.startswith(_URL_SCHEMES):
             raise ValueError("photo_link must be a valid URL starting with http:// or https://")
-        if len(self.photo_link) > 500:
-            raise ValueError("photo_link must be less than 500 characters")
+        if n > _PHOTO_LINK_MAX:
+            raise ValueError(f"photo_link must be less than {_PHOTO_LINK_MAX} characters")
         
         # Validate submission_date
         if not isinstance(self.submission_date, datetime):
             raise ValueError("submission_date must be a datetime object")
-        if self.submission_date > datetime.now():
+        if self.submission_date > now:
             raise ValueError("submission_date cannot be in the future")
         
         # Clean up string fields
-        self.photo_link = self.photo_link.strip()
+        self.photo_link = photo_link
         
         return True
     
@@ -306,23 +423,24 @@ class KPIRecord:
         """Convert record to dictionary for storage"""
         return {
             'user_id': self.user_id,
-            'record_date': self.record_date.isoformat(),
+            'record_date': _encode_datetime(self.record_date),
             'record_type': self.record_type,
             'value': self.value,
             'photo_link': self.photo_link,
-            'submission_date': self.submission_date.isoformat()
+            'submission_date': _encode_datetime(self.submission_date)
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'KPIRecord':
-        """Create KPIRecord instance from dictionary"""
-        # Convert datetime strings back to datetime objects
-        if isinstance(data.get('record_date'), str):
-            data['record_date'] = datetime.fromisoformat(data['record_date'])
-        if isinstance(data.get('submission_date'), str):
-            data['submission_date'] = datetime.fromisoformat(data['submission_date'])
-        
-        return cls(**data)
+        """Create KPIRecord instance from a stored dictionary without re-validating"""
+        # Convert stored datetimes back to datetime objects
+        if 'record_date' in data:
+            data['record_date'] = _decode_datetime(data['record_date'])
+        if 'submission_date' in data:
+            data['submission_date'] = _decode_datetime(data['submission_date'])
+        
+        with _skip_validation():
+            return cls(**data)
 
 
 @dataclass
@@ -353,7 +471,8 @@ class UserProgress:
     
     def __post_init__(self):
         """Validate data after initialization"""
-        self.validate()
+        if not _SKIP.get():
+            self.validate()
     
     def validate(self) -> bool:
         """
@@ -366,56 +485,49 @@ class UserProgress:
             ValueError: If validation fails
         """
         # Validate user_id
-        if not isinstance(self.user_id, int) or self.user_id <= 0:
+        if type(self.user_id) is not int or self.user_id <= 0:
             raise ValueError("user_id must be a positive integer")
         
         # Validate current_meetups
-        if not isinstance(self.current_meetups, int) or self.current_meetups < 0:
+        if type(self.current_meetups) is not int or self.current_meetups < 0:
             raise ValueError("current_meetups must be a non-negative integer")
         
         # Validate meetup_target
-        if not isinstance(self.meetup_target, int) or self.meetup_target < 0:
+        if type(self.meetup_target) is not int or self.meetup_target < 0:
             raise ValueError("meetup_target must be a non-negative integer")
         
         # Validate meetup_percentage
-        if not isinstance(self.meetup_percentage, (int, float)) or self.meetup_percentage < 0:
+        if type(self.meetup_percentage) not in _NUMERIC_TYPES or self.meetup_percentage < 0:
             raise ValueError("meetup_percentage must be a non-negative number")
         
         # Validate current_sales
-        if not isinstance(self.current_sales, (int, float)) or self.current_sales < 0:
+        if type(self.current_sales) not in _NUMERIC_TYPES or self.current_sales < 0:
             raise ValueError("current_sales must be a non-negative number")
         
         # Validate sales_target
-        if not isinstance(self.sales_target, (int, float)) or self.sales_target < 0:
+        if type(self.sales_target) not in _NUMERIC_TYPES or self.sales_target < 0:
             raise ValueError("sales_target must be a non-negative number")
         
         # Validate sales_percentage
-        if not isinstance(self.sales_percentage, (int, float)) or self.sales_percentage < 0:
+        if type(self.sales_percentage) not in _NUMERIC_TYPES or self.sales_percentage < 0:
             raise ValueError("sales_percentage must be a non-negative number")
         
         # Validate month
-        if not isinstance(self.month, int) or not (1 <= self.month <= 12):
+        month = self.month
+        if type(month) is not int or month < 1 or month > 12:
             raise ValueError("month must be an integer between 1 and 12")
         
         # Validate year
-        if not isinstance(self.year, int) or not (2020 <= self.year <= 2030):
+        year = self.year
+        if type(year) is not int or year < 2020 or year > 2030:
             raise ValueError("year must be an integer between 2020 and 2030")
         
         return True
     
     def calculate_percentages(self) -> None:
         """Recalculate completion percentages based on current values and targets"""
-        # Calculate meetup percentage
-        if self.meetup_target > 0:
-            self.meetup_percentage = min((self.current_meetups / self.meetup_target) * 100, 100.0)
-        else:
-            self.meetup_percentage = 0.0
-        
-        # Calculate sales percentage
-        if self.sales_target > 0:
-            self.sales_percentage = min((self.current_sales / self.sales_target) * 100, 100.0)
-        else:
-            self.sales_percentage = 0.0
+        self.meetup_percentage = _calc_pct(self.current_meetups, self.meetup_target)
+        self.sales_percentage = _calc_pct(self.current_sales, self.sales_target)
     
     def is_meetup_target_achieved(self) -> bool:
         """Check if meetup target is achieved"""
@@ -427,7 +539,7 @@ class UserProgress:
     
     def is_all_targets_achieved(self) -> bool:
         """Check if both targets are achieved"""
-        return self.is_meetup_target_achieved() and self.is_sales_target_achieved()
+        return self.current_meetups >= self.meetup_target and self.current_sales >= self.sales_target
     
     def to_dict(self) -> dict:
         """Convert progress to dictionary for storage"""
@@ -445,8 +557,9 @@ class UserProgress:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'UserProgress':
-        """Create UserProgress instance from dictionary"""
-        return cls(**data)
+        """Create UserProgress instance from a stored dictionary without re-validating"""
+        with _skip_validation():
+            return cls(**data)
     
     @classmethod
     def create_from_targets_and_records(
@@ -475,8 +588,8 @@ class UserProgress:
             UserProgress: Calculated progress instance
         """
         # Calculate current values from records
-        current_meetups = sum(record.value for record in (meetup_records or []))
-        current_sales = sum(record.value for record in (sales_records or []))
+        current_meetups = _sum_values(meetup_records)
+        current_sales = _sum_values(sales_records)
         
         # Create instance
         progress = cls(
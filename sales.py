@@ -8,29 +8,417 @@ This module handles all sales representative functionality including:
 - Photo upload handling
 """
 
+import asyncio
+import bisect
+import calendar
+import contextvars
+import functools
 import logging
-import gc
+import os
+import re
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict, Any
-from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from telegram import Update, Message, PhotoSize, ReplyKeyboardMarkup, ReplyKeyboardRemove
 from telegram.ext import (
+    Application, 
     ContextTypes, 
     ConversationHandler, 
     CommandHandler, 
     MessageHandler, 
+    TypeHandler,
     filters
 )
 import auth
+import google_drive
 import google_sheets
 import utils
 
 logger = logging.getLogger(__name__)
 
+# Per-user locks serializing Google Sheets access: one user's requests run in
+# order, different users run concurrently. Entries vanish once no handler holds them.
+_user_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def _user_lock(user_id: int) -> asyncio.Lock:
+    """Get the lock serializing Google Sheets access for a user"""
+    lock = _user_locks.get(user_id)
+    if lock is None:
+        lock = _user_locks[user_id] = asyncio.Lock()
+    return lock
+
+class _RateLimiter:
+    """
+    Token bucket allowing `rate` entries per `period` seconds, used as
+    `async with limiter:`; callers over the rate wait for the next token.
+    """
+    
+    def __init__(self, rate: int, period: float = 1.0):
+        self._rate = rate
+        self._interval = period / rate
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def __aenter__(self) -> "_RateLimiter":
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._updated) / self._interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return self
+                await asyncio.sleep((1 - self._tokens) * self._interval)
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        return False
+
+# Google write throttling: at most DRIVE_CONCURRENCY photo uploads in flight, and
+# Drive uploads plus Sheets appends together started at no more than 3 per second
+_DRIVE_CONCURRENCY = int(os.getenv('DRIVE_CONCURRENCY', '4'))
+
+class _LoopState:
+    """Asyncio primitives shared by handlers, bound to the event loop that created them"""
+    __slots__ = ('loop', 'drive_semaphore', 'google_write_limiter',
+                 'registration_queue', 'registration_worker')
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.drive_semaphore = asyncio.Semaphore(_DRIVE_CONCURRENCY)
+        self.google_write_limiter = _RateLimiter(3, 1.0)
+        # Completed registrations waiting to be written: (user_data, chat_id, bot)
+        self.registration_queue: "asyncio.Queue[Tuple[Dict[str, Any], int, Any]]" = asyncio.Queue()
+        self.registration_worker: Optional["asyncio.Task[None]"] = None
+
+_loop_state_current: Optional[_LoopState] = None
+
+def _loop_state() -> _LoopState:
+    """
+    Get the shared asyncio primitives for the running event loop
+    
+    They are created on first use inside the loop and replaced when the bot
+    is restarted on a new loop (main.py retries with a second asyncio.run()),
+    so nothing is used from a loop it is not bound to.
+    """
+    global _loop_state_current
+    loop = asyncio.get_running_loop()
+    if _loop_state_current is None or _loop_state_current.loop is not loop:
+        _loop_state_current = _LoopState(loop)
+    return _loop_state_current
+
+# Registered user cache: user_id -> (user_data, expiry), least recently used first
+_user_cache: "OrderedDict[int, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_USER_CACHE_TTL = 300  # seconds
+_USER_CACHE_MAX_SIZE = 10000
+
+async def _cached_get_user(user_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get registered user data, reusing a recent Google Sheets lookup
+    
+    Only registered users are cached; a miss (unregistered user or a failed
+    lookup) always goes back to Google Sheets.
+    
+    Args:
+        user_id (int): Telegram user ID
+        
+    Returns:
+        dict or None: User data dictionary if found, None otherwise
+    """
+    now = time.monotonic()
+    entry = _user_cache.get(user_id)
+    if entry is not None and now < entry[1]:
+        _user_cache.move_to_end(user_id)
+        return entry[0]
+    
+    # Sheets calls are blocking HTTP; keep them off the event loop
+    async with _user_lock(user_id):
+        user_data = await asyncio.to_thread(google_sheets.get_user_by_id, user_id)
+    if user_data:
+        _cache_user(user_id, user_data, now)
+    else:
+        _user_cache.pop(user_id, None)
+    
+    return user_data
+
+def _cache_user(user_id: int, user_data: Dict[str, Any], now: Optional[float] = None) -> None:
+    """Store registered user data in the lookup cache"""
+    if now is None:
+        now = time.monotonic()
+    _user_cache[user_id] = (user_data, now + _USER_CACHE_TTL)
+    _user_cache.move_to_end(user_id)
+    if len(_user_cache) > _USER_CACHE_MAX_SIZE:
+        _user_cache.popitem(last=False)
+
+# Monthly progress cache: (user_id, year, month) -> (progress, expiry)
+_progress_cache: "OrderedDict[Tuple[int, int, int], Tuple[Dict[str, Any], float]]" = OrderedDict()
+_PROGRESS_CACHE_TTL = 60  # seconds
+_PROGRESS_CACHE_MAX_SIZE = 10000
+
+async def _cached_user_progress(user_id: int, month: int, year: int) -> Optional[Dict[str, Any]]:
+    """
+    Get monthly progress for a user, reusing a recent calculation
+    
+    As with _cached_get_user, only successful results are cached.
+    
+    Args:
+        user_id (int): Telegram user ID
+        month (int): Month for progress calculation (1-12)
+        year (int): Year for progress calculation
+        
+    Returns:
+        dict or None: Progress data dictionary if targets exist, None otherwise
+    """
+    key = (user_id, year, month)
+    now = time.monotonic()
+    entry = _progress_cache.get(key)
+    if entry is not None and now < entry[1]:
+        _progress_cache.move_to_end(key)
+        return entry[0]
+    
+    async with _user_lock(user_id):
+        progress = await asyncio.to_thread(google_sheets.calculate_user_progress, user_id, month, year)
+    if progress:
+        _cache_progress(key, progress, now)
+    else:
+        _progress_cache.pop(key, None)
+    
+    return progress
+
+def _cache_progress(key: Tuple[int, int, int], progress: Dict[str, Any], now: Optional[float] = None) -> None:
+    """Store monthly progress in the progress cache"""
+    if now is None:
+        now = time.monotonic()
+    _progress_cache[key] = (progress, now + _PROGRESS_CACHE_TTL)
+    _progress_cache.move_to_end(key)
+    if len(_progress_cache) > _PROGRESS_CACHE_MAX_SIZE:
+        _progress_cache.popitem(last=False)
+
+def _invalidate_cached_progress(user_id: int, month: int, year: int) -> None:
+    """Drop a user's cached progress for a month after a new KPI record"""
+    _progress_cache.pop((user_id, year, month), None)
+
+# Most queued registrations written with one Google Sheets append
+_REGISTRATION_BATCH_SIZE = 50
+
+def _handler_guard(error_type: Optional[str], error_message: Optional[str],
+                   error_state: Optional[int] = ConversationHandler.END,
+                   cleanup: Optional[Callable[[ContextTypes.DEFAULT_TYPE], None]] = None) -> Callable:
+    """
+    Decorator giving a conversation handler its error boundary
+    
+    The handler runs under utils.request_time(), so the time helpers share one
+    clock reading per update. An exception escaping the handler is logged, answered with
+    format_error_message(error_type, error_message) (skipped when error_type
+    is None), optionally followed by cleanup(context), and turned into
+    error_state as the handler's return value.
+    
+    Args:
+        error_type (str or None): Error type for the user-facing message
+        error_message (str or None): Custom message for the user
+        error_state (int or None): Value returned after an error
+        cleanup (callable, optional): Context cleanup to run after an error
+        
+    Returns:
+        Callable: Decorator for async handlers
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+            try:
+                with utils.request_time():
+                    return await func(update, context, *args, **kwargs)
+            except Exception as e:
+                logger.error("Error in %s: %s", func.__name__, e, exc_info=True)
+                if error_type is not None:
+                    await update.message.reply_text(
+                        utils.format_error_message(error_type, error_message)
+                    )
+                if cleanup is not None:
+                    cleanup(context)
+                return error_state
+        return wrapper
+    return decorator
+
 # Registration conversation states
 REGISTRATION_NAME, REGISTRATION_NATIONALITY, REGISTRATION_PHONE, REGISTRATION_UPLINE = range(4)
 
+# Abandoned registrations are ended (and their context cleared) after this many seconds
+REGISTRATION_TIMEOUT = 600
+
+# Escapes user-supplied text for messages sent with parse_mode='Markdown'
+_MD_ESCAPE = str.maketrans({c: '\\' + c for c in '_*`['})
+
+# Plain text replies (not commands) answer a conversation step; built once
+_TEXT_NOT_CMD = filters.TEXT & ~filters.COMMAND
+
+# Matches any digit; used to check a phone number contains at least one
+_HAS_DIGIT = re.compile(r'\d')
+
+# context.user_data keys used by the registration conversation
+_REGISTRATION_KEYS = frozenset((
+    'registration_user_id', 'registration_name', 'registration_nationality',
+    'registration_phone', 'registration_upline', 'registration_start_time'
+))
+
+# Registration messages (static text is built once at import)
+_ALREADY_REGISTERED_TEMPLATE = (
+    "👋 Hello {name}!\n\n"
+    "✅ You are already registered in the KPI system.\n\n"
+    "📊 Use /kpi to view your progress\n"
+    "🤝 Use /submitkpi to submit meetup records\n"
+    "💰 Use /submitsale to submit sales records"
+)
+_WELCOME_TEMPLATE = (
+    "{greeting_emoji} **Welcome to KPI Bot Registration!**\n\n"
+    "Hello {user_name}! Let's get you registered in the system.\n\n"
+    "📝 I'll need to collect some information from you:\n"
+    "• Your full name\n"
+    "• Your nationality\n"
+    "• Your phone number\n"
+    "• Your upline's name\n\n"
+    "Let's start! Please enter your **full name**:"
+)
+_NAME_INVALID_SHORT = (
+    "⚠️ Please enter a valid name (at least 2 characters).\n\n"
+    "Enter your full name:"
+)
+_NAME_INVALID_LONG = (
+    "⚠️ Name is too long (maximum 100 characters).\n\n"
+    "Enter your full name:"
+)
+_NATIONALITY_INVALID_SHORT = (
+    "⚠️ Please enter a valid nationality (at least 2 characters).\n\n"
+    "Enter your nationality:"
+)
+_NATIONALITY_INVALID_LONG = (
+    "⚠️ Nationality is too long (maximum 50 characters).\n\n"
+    "Enter your nationality:"
+)
+_PHONE_INVALID_SHORT = (
+    "⚠️ Please enter a valid phone number (at least 7 digits).\n\n"
+    "Enter your phone number:"
+)
+_PHONE_INVALID_LONG = (
+    "⚠️ Phone number is too long (maximum 20 characters).\n\n"
+    "Enter your phone number:"
+)
+_PHONE_INVALID_NO_DIGITS = (
+    "⚠️ Phone number must contain digits.\n\n"
+    "Enter your phone number:"
+)
+_UPLINE_INVALID_SHORT = (
+    "⚠️ Please enter a valid upline name (at least 2 characters).\n\n"
+    "Enter your upline's name:"
+)
+_UPLINE_INVALID_LONG = (
+    "⚠️ Upline name is too long (maximum 100 characters).\n\n"
+    "Enter your upline's name:"
+)
+_NAME_ACCEPTED_TEMPLATE = (
+    "✅ Great! Your name: **{name}**\n\n"
+    "🌍 Now, please enter your **nationality**:"
+)
+_NATIONALITY_ACCEPTED_TEMPLATE = (
+    "✅ Nationality: **{nationality}**\n\n"
+    "📱 Now, please enter your **phone number** (with country code if international):"
+)
+_PHONE_ACCEPTED_TEMPLATE = (
+    "✅ Phone: **{phone}**\n\n"
+    "👥 Finally, please enter your **upline's name** (the person who referred you):"
+)
+_REGISTRATION_SUCCESS_TEMPLATE = (
+    "🎉 **Registration Completed Successfully!**\n\n"
+    "📋 **Your Information:**\n"
+    "• **Name:** {name}\n"
+    "• **Nationality:** {nationality}\n"
+    "• **Phone:** {phone}\n"
+    "• **Upline:** {upline}\n\n"
+    "✅ You are now registered in the KPI system!\n\n"
+    "🚀 **What's Next?**\n"
+    "📊 Use /kpi to view your progress\n"
+    "🤝 Use /submitkpi to submit meetup records\n"
+    "💰 Use /submitsale to submit sales records\n\n"
+    "Welcome to the team! 🎊"
+)
+_REGISTRATION_RECEIVED_MSG = (
+    "⏳ Registration received - processing...\n\n"
+    "You'll get a confirmation message here in a moment."
+)
+_REGISTRATION_FAILED_MSG = (
+    "❌ **Registration Failed**\n\n"
+    "We encountered an error while saving your registration data.\n"
+    "This might be due to:\n"
+    "• Database connection issues\n"
+    "• Duplicate registration attempt\n"
+    "• System maintenance\n\n"
+    "🔄 Please try again later using /register\n"
+    "If the problem persists, contact your administrator."
+)
+_REGISTRATION_CANCEL_MSG = (
+    "❌ **Registration Cancelled**\n\n"
+    "Your registration process has been cancelled.\n"
+    "No data has been saved.\n\n"
+    "🔄 You can start registration again anytime using /register"
+)
+
+async def _validate_and_store(update: Update, context: ContextTypes.DEFAULT_TYPE, key: str,
+                              min_len: int, max_len: int, too_short_msg: str, too_long_msg: str,
+                              pattern: Optional[re.Pattern] = None,
+                              pattern_msg: Optional[str] = None) -> Optional[str]:
+    """
+    Validate a registration text answer and store it in context.user_data
+    
+    Args:
+        update (Update): Telegram update object
+        context (ContextTypes.DEFAULT_TYPE): Telegram context
+        key (str): context.user_data key to store the answer under
+        min_len (int): Minimum accepted length
+        max_len (int): Maximum accepted length
+        too_short_msg (str): Reply sent when the answer is too short
+        too_long_msg (str): Reply sent when the answer is too long
+        pattern (re.Pattern, optional): Pattern the answer must contain
+        pattern_msg (str, optional): Reply sent when the pattern is not found
+        
+    Returns:
+        Optional[str]: The stripped answer, or None if it was rejected (the user has been re-prompted)
+    """
+    message = update.message
+    reply = message.reply_text
+    value = message.text.strip()
+    n = len(value)
+    
+    if n < min_len:
+        await reply(too_short_msg)
+        return None
+    
+    if n > max_len:
+        await reply(too_long_msg)
+        return None
+    
+    if pattern is not None and pattern.search(value) is None:
+        await reply(pattern_msg)
+        return None
+    
+    context.user_data[key] = value
+    return value
+
+def cleanup_registration_context(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Clean up registration conversation context data
+    
+    Args:
+        context (ContextTypes.DEFAULT_TYPE): Telegram context
+    """
+    user_data = context.user_data
+    for key in _REGISTRATION_KEYS & user_data.keys():
+        del user_data[key]
+
 # Registration Conversation Handler
 @auth.require_sales
+@_handler_guard("registration", "Failed to start registration process.")
 async def register_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Start registration conversation for new sales representatives
@@ -42,52 +430,35 @@ async def register_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     Returns:
         int: Next conversation state
     """
-    try:
-        user_id = update.effective_user.id
-        user_name = update.effective_user.first_name or "User"
-        
-        # Check if user is already registered
-        existing_user = google_sheets.get_user_by_id(user_id)
-        if existing_user:
-            message = (
-                f"👋 Hello {existing_user['name']}!\n\n"
-                "✅ You are already registered in the KPI system.\n\n"
-                "📊 Use /kpi to view your progress\n"
-                "🤝 Use /submitkpi to submit meetup records\n"
-                "💰 Use /submitsale to submit sales records"
-            )
-            await update.message.reply_text(message)
-            return ConversationHandler.END
-        
-        # Start registration process
-        greeting_emoji = utils.get_greeting_emoji()
-        message = (
-            f"{greeting_emoji} **Welcome to KPI Bot Registration!**\n\n"
-            f"Hello {user_name}! Let's get you registered in the system.\n\n"
-            "📝 I'll need to collect some information from you:\n"
-            "• Your full name\n"
-            "• Your nationality\n"
-            "• Your phone number\n"
-            "• Your upline's name\n\n"
-            "Let's start! Please enter your **full name**:"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        # Store user_id in context for later use
-        context.user_data['registration_user_id'] = user_id
-        context.user_data['registration_start_time'] = datetime.now()
-        
-        logger.info(f"Started registration process for user {user_id} ({user_name})")
-        return REGISTRATION_NAME
-        
-    except Exception as e:
-        logger.error(f"Error in register_command: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("registration", "Failed to start registration process.")
-        )
+    reply = update.message.reply_text
+    
+    user_id = update.effective_user.id
+    user_name = update.effective_user.first_name or "User"
+    
+    # Check if user is already registered
+    existing_user = await _cached_get_user(user_id)
+    if existing_user:
+        message = _ALREADY_REGISTERED_TEMPLATE.format(name=existing_user['name'])
+        await reply(message)
         return ConversationHandler.END
+    
+    # Start registration process
+    message = _WELCOME_TEMPLATE.format(
+        greeting_emoji=utils.get_greeting_emoji(),
+        user_name=user_name.translate(_MD_ESCAPE)
+    )
+    
+    await reply(message, parse_mode='Markdown')
+    
+    # Store user_id in context for later use
+    ud = context.user_data
+    ud['registration_user_id'] = user_id
+    ud['registration_start_time'] = time.monotonic()
+    
+    logger.info("Started registration process for user %s (%s)", user_id, user_name)
+    return REGISTRATION_NAME
 
+@_handler_guard("validation", "Failed to process name input.", REGISTRATION_NAME)
 async def registration_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle name input during registration
@@ -99,44 +470,23 @@ async def registration_name(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Returns:
         int: Next conversation state
     """
-    try:
-        name = update.message.text.strip()
-        
-        # Validate name input
-        if not name or len(name) < 2:
-            await update.message.reply_text(
-                "⚠️ Please enter a valid name (at least 2 characters).\n\n"
-                "Enter your **full name**:"
-            )
-            return REGISTRATION_NAME
-        
-        if len(name) > 100:
-            await update.message.reply_text(
-                "⚠️ Name is too long (maximum 100 characters).\n\n"
-                "Enter your **full name**:"
-            )
-            return REGISTRATION_NAME
-        
-        # Store name in context
-        context.user_data['registration_name'] = name
-        
-        message = (
-            f"✅ Great! Your name: **{name}**\n\n"
-            "🌍 Now, please enter your **nationality**:"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        logger.info(f"Registration name collected for user {context.user_data.get('registration_user_id')}: {name}")
-        return REGISTRATION_NATIONALITY
-        
-    except Exception as e:
-        logger.error(f"Error in registration_name: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("validation", "Failed to process name input.")
-        )
+    reply = update.message.reply_text
+    
+    name = await _validate_and_store(
+        update, context, 'registration_name', 2, 100,
+        _NAME_INVALID_SHORT, _NAME_INVALID_LONG
+    )
+    if name is None:
         return REGISTRATION_NAME
+    
+    message = _NAME_ACCEPTED_TEMPLATE.format(name=name.translate(_MD_ESCAPE))
+    
+    await reply(message, parse_mode='Markdown')
+    
+    logger.info("Registration name collected for user %s: %s", context.user_data.get('registration_user_id'), name)
+    return REGISTRATION_NATIONALITY
 
+@_handler_guard("validation", "Failed to process nationality input.", REGISTRATION_NATIONALITY)
 async def registration_nationality(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle nationality input during registration
@@ -148,44 +498,23 @@ async def registration_nationality(update: Update, context: ContextTypes.DEFAULT
     Returns:
         int: Next conversation state
     """
-    try:
-        nationality = update.message.text.strip()
-        
-        # Validate nationality input
-        if not nationality or len(nationality) < 2:
-            await update.message.reply_text(
-                "⚠️ Please enter a valid nationality (at least 2 characters).\n\n"
-                "Enter your **nationality**:"
-            )
-            return REGISTRATION_NATIONALITY
-        
-        if len(nationality) > 50:
-            await update.message.reply_text(
-                "⚠️ Nationality is too long (maximum 50 characters).\n\n"
-                "Enter your **nationality**:"
-            )
-            return REGISTRATION_NATIONALITY
-        
-        # Store nationality in context
-        context.user_data['registration_nationality'] = nationality
-        
-        message = (
-            f"✅ Nationality: **{nationality}**\n\n"
-            "📱 Now, please enter your **phone number** (with country code if international):"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        logger.info(f"Registration nationality collected for user {context.user_data.get('registration_user_id')}: {nationality}")
-        return REGISTRATION_PHONE
-        
-    except Exception as e:
-        logger.error(f"Error in registration_nationality: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("validation", "Failed to process nationality input.")
-        )
+    reply = update.message.reply_text
+    
+    nationality = await _validate_and_store(
+        update, context, 'registration_nationality', 2, 50,
+        _NATIONALITY_INVALID_SHORT, _NATIONALITY_INVALID_LONG
+    )
+    if nationality is None:
         return REGISTRATION_NATIONALITY
+    
+    message = _NATIONALITY_ACCEPTED_TEMPLATE.format(nationality=nationality.translate(_MD_ESCAPE))
+    
+    await reply(message, parse_mode='Markdown')
+    
+    logger.info("Registration nationality collected for user %s: %s", context.user_data.get('registration_user_id'), nationality)
+    return REGISTRATION_PHONE
 
+@_handler_guard("validation", "Failed to process phone input.", REGISTRATION_PHONE)
 async def registration_phone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle phone number input during registration
@@ -197,52 +526,25 @@ async def registration_phone(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Returns:
         int: Next conversation state
     """
-    try:
-        phone = update.message.text.strip()
-        
-        # Validate phone input
-        if not phone or len(phone) < 7:
-            await update.message.reply_text(
-                "⚠️ Please enter a valid phone number (at least 7 digits).\n\n"
-                "Enter your **phone number**:"
-            )
-            return REGISTRATION_PHONE
-        
-        if len(phone) > 20:
-            await update.message.reply_text(
-                "⚠️ Phone number is too long (maximum 20 characters).\n\n"
-                "Enter your **phone number**:"
-            )
-            return REGISTRATION_PHONE
-        
-        # Basic phone number validation (contains digits)
-        if not any(char.isdigit() for char in phone):
-            await update.message.reply_text(
-                "⚠️ Phone number must contain digits.\n\n"
-                "Enter your **phone number**:"
-            )
-            return REGISTRATION_PHONE
-        
-        # Store phone in context
-        context.user_data['registration_phone'] = phone
-        
-        message = (
-            f"✅ Phone: **{phone}**\n\n"
-            "👥 Finally, please enter your **upline's name** (the person who referred you):"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        logger.info(f"Registration phone collected for user {context.user_data.get('registration_user_id')}: {phone}")
-        return REGISTRATION_UPLINE
-        
-    except Exception as e:
-        logger.error(f"Error in registration_phone: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("validation", "Failed to process phone input.")
-        )
+    reply = update.message.reply_text
+    
+    # Basic phone number validation (length and contains digits)
+    phone = await _validate_and_store(
+        update, context, 'registration_phone', 7, 20,
+        _PHONE_INVALID_SHORT, _PHONE_INVALID_LONG,
+        _HAS_DIGIT, _PHONE_INVALID_NO_DIGITS
+    )
+    if phone is None:
         return REGISTRATION_PHONE
+    
+    message = _PHONE_ACCEPTED_TEMPLATE.format(phone=phone.translate(_MD_ESCAPE))
+    
+    await reply(message, parse_mode='Markdown')
+    
+    logger.info("Registration phone collected for user %s: %s", context.user_data.get('registration_user_id'), phone)
+    return REGISTRATION_UPLINE
 
+@_handler_guard("registration", "Failed to complete registration.", cleanup=cleanup_registration_context)
 async def registration_upline(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle upline name input and complete registration
@@ -254,108 +556,104 @@ async def registration_upline(update: Update, context: ContextTypes.DEFAULT_TYPE
     Returns:
         int: ConversationHandler.END
     """
-    try:
-        upline = update.message.text.strip()
-        
-        # Validate upline input
-        if not upline or len(upline) < 2:
-            await update.message.reply_text(
-                "⚠️ Please enter a valid upline name (at least 2 characters).\n\n"
-                "Enter your **upline's name**:"
-            )
-            return REGISTRATION_UPLINE
-        
-        if len(upline) > 100:
-            await update.message.reply_text(
-                "⚠️ Upline name is too long (maximum 100 characters).\n\n"
-                "Enter your **upline's name**:"
-            )
-            return REGISTRATION_UPLINE
-        
-        # Store upline in context
-        context.user_data['registration_upline'] = upline
-        
-        # Prepare user data for registration
-        user_data = {
-            'user_id': context.user_data['registration_user_id'],
-            'name': context.user_data['registration_name'],
-            'nationality': context.user_data['registration_nationality'],
-            'phone': context.user_data['registration_phone'],
-            'upline': upline,
-            'registration_date': datetime.now().isoformat(),
-            'role': 'sales'
-        }
-        
-        # Attempt to register user in Google Sheets
-        registration_success = google_sheets.register_user(user_data)
-        
-        if registration_success:
-            # Registration successful
-            success_message = (
-                "🎉 **Registration Completed Successfully!**\n\n"
-                "📋 **Your Information:**\n"
-                f"• **Name:** {user_data['name']}\n"
-                f"• **Nationality:** {user_data['nationality']}\n"
-                f"• **Phone:** {user_data['phone']}\n"
-                f"• **Upline:** {user_data['upline']}\n\n"
-                "✅ You are now registered in the KPI system!\n\n"
-                "🚀 **What's Next?**\n"
-                "📊 Use /kpi to view your progress\n"
-                "🤝 Use /submitkpi to submit meetup records\n"
-                "💰 Use /submitsale to submit sales records\n\n"
-                "Welcome to the team! 🎊"
-            )
-            
-            await update.message.reply_text(success_message, parse_mode='Markdown')
-            
-            logger.info(f"Registration completed successfully for user {user_data['user_id']} ({user_data['name']})")
-            
-        else:
-            # Registration failed
-            error_message = (
-                "❌ **Registration Failed**\n\n"
-                "We encountered an error while saving your registration data.\n"
-                "This might be due to:\n"
-                "• Database connection issues\n"
-                "• Duplicate registration attempt\n"
-                "• System maintenance\n\n"
-                "🔄 Please try again later using /register\n"
-                "If the problem persists, contact your administrator."
-            )
-            
-            await update.message.reply_text(error_message, parse_mode='Markdown')
-            
-            logger.error(f"Registration failed for user {user_data['user_id']} ({user_data['name']})")
-        
-        # Clean up context data
-        registration_keys = [
-            'registration_user_id', 'registration_name', 'registration_nationality',
-            'registration_phone', 'registration_upline', 'registration_start_time'
-        ]
-        for key in registration_keys:
-            context.user_data.pop(key, None)
-        
-        # Force garbage collection to clean up memory
-        gc.collect()
-        
-        return ConversationHandler.END
-        
-    except Exception as e:
-        logger.error(f"Error in registration_upline: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("registration", "Failed to complete registration.")
+    reply = update.message.reply_text
+    
+    upline = await _validate_and_store(
+        update, context, 'registration_upline', 2, 100,
+        _UPLINE_INVALID_SHORT, _UPLINE_INVALID_LONG
+    )
+    if upline is None:
+        return REGISTRATION_UPLINE
+    
+    # Prepare user data for registration
+    ud = context.user_data
+    user_data = {
+        'user_id': ud['registration_user_id'],
+        'name': ud['registration_name'],
+        'nationality': ud['registration_nationality'],
+        'phone': ud['registration_phone'],
+        'upline': upline,
+        'registration_date': utils.current_time().isoformat(),
+        'role': 'sales'
+    }
+    
+    # Queue the registration for the background Google Sheets writer;
+    # the user is told the outcome once the batch has been flushed
+    _loop_state().registration_queue.put_nowait((user_data, update.effective_chat.id, context.bot))
+    _ensure_registration_worker(context.application)
+    
+    await reply(_REGISTRATION_RECEIVED_MSG)
+    
+    logger.info("Registration queued for user %s (%s)", user_data['user_id'], user_data['name'])
+    
+    # Clean up context data
+    cleanup_registration_context(context)
+    
+    return ConversationHandler.END
+
+def _ensure_registration_worker(application: Application) -> None:
+    """
+    Start the background registration writer if it is not running
+    
+    The writer is started through application.create_task so Application.stop()
+    waits for queued registrations to be written. It runs in a fresh context,
+    not the handler's, so it does not inherit the handler's request_time().
+    
+    Args:
+        application (Application): Running bot application
+    """
+    state = _loop_state()
+    if state.registration_worker is None or state.registration_worker.done():
+        state.registration_worker = contextvars.Context().run(
+            application.create_task, _registration_flush_worker(state.registration_queue)
         )
+
+async def _registration_flush_worker(queue: "asyncio.Queue[Tuple[Dict[str, Any], int, Any]]") -> None:
+    """
+    Write queued registrations to Google Sheets in batches
+    
+    Takes up to _REGISTRATION_BATCH_SIZE queued registrations at a time,
+    writes them with a single append and then tells each user whether their
+    registration succeeded. Returns once the queue is empty; the next
+    registration starts a new writer.
+    
+    Args:
+        queue (asyncio.Queue): Registration queue of the running loop
+    """
+    while not queue.empty():
+        batch = []
+        while len(batch) < _REGISTRATION_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
         
-        # Clean up context data on error
-        registration_keys = [
-            'registration_user_id', 'registration_name', 'registration_nationality',
-            'registration_phone', 'registration_upline', 'registration_start_time'
-        ]
-        for key in registration_keys:
-            context.user_data.pop(key, None)
-        
-        return ConversationHandler.END
+        users = [user_data for user_data, _, _ in batch]
+        try:
+            async with _loop_state().google_write_limiter:
+                results = await asyncio.to_thread(google_sheets.register_users_batch, users)
+        except Exception as e:
+            logger.error("Error writing registration batch of %s: %s", len(batch), e)
+            results = [False] * len(batch)
+        
+        for (user_data, chat_id, bot), registration_success in zip(batch, results):
+            try:
+                if registration_success:
+                    # The new registration is known; serve it from the cache
+                    _cache_user(user_data['user_id'], user_data)
+                    await bot.send_message(
+                        chat_id,
+                        _REGISTRATION_SUCCESS_TEMPLATE.format_map({
+                            key: value.translate(_MD_ESCAPE) if isinstance(value, str) else value
+                            for key, value in user_data.items()
+                        }),
+                        parse_mode='Markdown'
+                    )
+                    logger.info("Registration completed successfully for user %s (%s)", user_data['user_id'], user_data['name'])
+                else:
+                    await bot.send_message(chat_id, _REGISTRATION_FAILED_MSG, parse_mode='Markdown')
+                    logger.error("Registration failed for user %s (%s)", user_data['user_id'], user_data['name'])
+            except Exception as e:
+                logger.error("Error sending registration result to user %s: %s", user_data['user_id'], e)
 
+@_handler_guard(None, None)
 async def registration_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle registration cancellation
@@ -367,59 +665,64 @@ async def registration_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE
     Returns:
         int: ConversationHandler.END
     """
-    try:
-        user_id = update.effective_user.id if update.effective_user else "Unknown"
-        
-        message = (
-            "❌ **Registration Cancelled**\n\n"
-            "Your registration process has been cancelled.\n"
-            "No data has been saved.\n\n"
-            "🔄 You can start registration again anytime using /register"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        # Clean up context data
-        registration_keys = [
-            'registration_user_id', 'registration_name', 'registration_nationality',
-            'registration_phone', 'registration_upline', 'registration_start_time'
-        ]
-        for key in registration_keys:
-            context.user_data.pop(key, None)
-        
-        logger.info(f"Registration cancelled by user {user_id}")
-        
-        # Force garbage collection
-        gc.collect()
-        
-        return ConversationHandler.END
+    user_id = update.effective_user.id if update.effective_user else "Unknown"
+    
+    await update.message.reply_text(_REGISTRATION_CANCEL_MSG, parse_mode='Markdown')
+    
+    # Clean up context data
+    cleanup_registration_context(context)
+    
+    logger.info("Registration cancelled by user %s", user_id)
+    
+    return ConversationHandler.END
+
+async def registration_timeout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """
+    Handle a registration conversation that was abandoned mid-way
+    
+    Args:
+        update (Update): Last update processed in the conversation
+        context (ContextTypes.DEFAULT_TYPE): Telegram context
         
-    except Exception as e:
-        logger.error(f"Error in registration_cancel: {e}")
-        return ConversationHandler.END
+    Returns:
+        int: ConversationHandler.END
+    """
+    user_id = context.user_data.get('registration_user_id', "Unknown")
+    cleanup_registration_context(context)
+    
+    logger.info("Registration timed out for user %s", user_id)
+    return ConversationHandler.END
 
 # Create registration conversation handler
 def create_registration_handler() -> ConversationHandler:
     """
     Create and return the registration conversation handler
     
+    The entry point and input handlers run with block=False so a slow
+    Google Sheets call for one user does not hold up updates from other
+    chats. They are re-entrant: all per-user state lives in
+    context.user_data.
+    
     Returns:
         ConversationHandler: Configured registration conversation handler
     """
     return ConversationHandler(
-        entry_points=[CommandHandler('register', register_command)],
+        entry_points=[CommandHandler('register', register_command, block=False)],
         states={
             REGISTRATION_NAME: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, registration_name)
+                MessageHandler(_TEXT_NOT_CMD, registration_name, block=False)
             ],
             REGISTRATION_NATIONALITY: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, registration_nationality)
+                MessageHandler(_TEXT_NOT_CMD, registration_nationality, block=False)
             ],
             REGISTRATION_PHONE: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, registration_phone)
+                MessageHandler(_TEXT_NOT_CMD, registration_phone, block=False)
             ],
             REGISTRATION_UPLINE: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, registration_upline)
+                MessageHandler(_TEXT_NOT_CMD, registration_upline, block=False)
+            ],
+            ConversationHandler.TIMEOUT: [
+                TypeHandler(Update, registration_timeout)
             ],
         },
         fallbacks=[
@@ -429,10 +732,79 @@ def create_registration_handler() -> ConversationHandler:
         per_chat=True,
         per_user=True,
         allow_reentry=True,
+        conversation_timeout=REGISTRATION_TIMEOUT,
         name="registration_conversation"
     )
+# Overall percentage thresholds; bisect_right() indexes the tables below
+_PROGRESS_THRESHOLDS = (25, 50, 75, 100)
+
+# KPI motivation messages: (motivation, next action template), lowest band first
+_MOTIVATIONS = (
+    ("🚀 Time to accelerate! You've got this!", "Focus and push hard - {days} days left!"),
+    ("📈 Making progress! Keep pushing forward!", "Increase your efforts - {days} days remaining!"),
+    ("👍 Good progress! You're on the right track!", "Focus on the remaining targets with {days} days left!"),
+    ("⭐ Excellent progress! You're almost there!", "Just a little more push to reach 100%!"),
+    ("🏆 Outstanding! You've achieved all your targets!", "Keep up the excellent work and help your teammates!"),
+)
+
+# Overall status shown by format_kpi_display: (emoji, status), lowest band first
+_OVERALL_STATUSES = (
+    ("🚀", "Just getting started!"),
+    ("📈", "Making progress!"),
+    ("👍", "Good progress!"),
+    ("⭐", "Excellent progress!"),
+    ("🏆", "All targets achieved!"),
+)
+
+# KPI display messages
+_KPI_NOT_REGISTERED_TEMPLATE = (
+    "🚫 **Not Registered**\n\n"
+    "Hello {user_name}! You need to register first before viewing your KPI progress.\n\n"
+    "📝 Use /register to get started"
+)
+_KPI_NO_TARGETS_TEMPLATE = (
+    "📊 **KPI Progress - {month_name}**\n\n"
+    "👋 Hello {name}!\n\n"
+    "🎯 **No targets set for this month**\n\n"
+    "Your admin needs to set your monthly targets before you can track progress.\n"
+    "Please contact your admin to set up your KPI targets.\n\n"
+    "💡 **Available Commands:**\n"
+    "🤝 /submitkpi - Submit meetup records\n"
+    "💰 /submitsale - Submit sales records"
+)
+_KPI_PROGRESS_TEMPLATE = (
+    "📊 **KPI Progress - {month_name}**\n\n"
+    "👋 Hello {name}!\n\n"
+    "{progress_summary}\n\n"
+    "📅 **Time Remaining:** {days_remaining} days\n\n"
+    "💪 **{motivation}**\n"
+    "🎯 {next_action}\n\n"
+    "💡 **Quick Actions:**\n"
+    "🤝 /submitkpi - Submit meetup records\n"
+    "💰 /submitsale - Submit sales records"
+)
+_KPI_DISPLAY_TEMPLATE = (
+    "📊 **KPI Progress - {month_name}**\n\n"
+    "👋 Hello {user_name}!\n\n"
+    "🤝 **Meetups:**\n"
+    "{meetup_bar}\n"
+    "Target: {meetup_target} meetups\n"
+    "Current: {current_meetups} meetups\n\n"
+    "💰 **Sales:**\n"
+    "{sales_bar}\n"
+    "Target: {sales_target}\n"
+    "Current: {current_sales}\n\n"
+    "{overall_emoji} **Overall:** {overall_status} ({overall_pct:.1f}%)"
+)
+
+@functools.lru_cache(maxsize=256)
+def _days_in_month(year: int, month: int) -> int:
+    """Number of days in the given month"""
+    return calendar.monthrange(year, month)[1]
+
 # KPI Viewing Handler
 @auth.require_sales
+@_handler_guard("kpi_display", "Failed to retrieve KPI progress.", None)
 async def kpi_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Display current KPI progress for the sales representative
@@ -441,102 +813,63 @@ async def kpi_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         update (Update): Telegram update object
         context (ContextTypes.DEFAULT_TYPE): Telegram context
     """
-    try:
-        user_id = update.effective_user.id
-        user_name = update.effective_user.first_name or "User"
-        
-        # Check if user is registered
-        user_data = google_sheets.get_user_by_id(user_id)
-        if not user_data:
-            message = (
-                "🚫 **Not Registered**\n\n"
-                f"Hello {user_name}! You need to register first before viewing your KPI progress.\n\n"
-                "📝 Use /register to get started"
-            )
-            await update.message.reply_text(message, parse_mode='Markdown')
-            return
-        
-        # Get current month and year
-        now = datetime.now()
-        current_month = now.month
-        current_year = now.year
-        
-        # Calculate user progress for current month
-        progress = google_sheets.calculate_user_progress(user_id, current_month, current_year)
-        
-        if not progress:
-            # No targets set for current month
-            month_name = now.strftime("%B %Y")
-            message = (
-                f"📊 **KPI Progress - {month_name}**\n\n"
-                f"👋 Hello {user_data['name']}!\n\n"
-                "🎯 **No targets set for this month**\n\n"
-                "Your admin needs to set your monthly targets before you can track progress.\n"
-                "Please contact your admin to set up your KPI targets.\n\n"
-                "💡 **Available Commands:**\n"
-                "🤝 /submitkpi - Submit meetup records\n"
-                "💰 /submitsale - Submit sales records"
-            )
-            await update.message.reply_text(message, parse_mode='Markdown')
-            return
-        
-        # Format progress display
+    user_id = update.effective_user.id
+    user_name = update.effective_user.first_name or "User"
+    
+    # Check if user is registered
+    user_data = await _cached_get_user(user_id)
+    if not user_data:
+        message = _KPI_NOT_REGISTERED_TEMPLATE.format(user_name=user_name.translate(_MD_ESCAPE))
+        await update.message.reply_text(message, parse_mode='Markdown')
+        return
+    
+    # Get current month and year
+    now = utils.current_time()
+    current_month = now.month
+    current_year = now.year
+    
+    # Calculate user progress for current month
+    progress = await _cached_user_progress(user_id, current_month, current_year)
+    
+    if not progress:
+        # No targets set for current month
         month_name = now.strftime("%B %Y")
-        
-        # Create progress summary using utility function
-        progress_summary = utils.format_progress_summary(
-            progress['current_meetups'],
-            progress['meetup_target'],
-            progress['current_sales'],
-            progress['sales_target']
-        )
-        
-        # Calculate days remaining in month
-        import calendar
-        days_in_month = calendar.monthrange(current_year, current_month)[1]
-        days_remaining = days_in_month - now.day
-        
-        # Determine motivational message based on progress
-        overall_pct = (progress['meetup_percentage'] + progress['sales_percentage']) / 2
-        
-        if overall_pct >= 100:
-            motivation = "🏆 Outstanding! You've achieved all your targets!"
-            next_action = "Keep up the excellent work and help your teammates!"
-        elif overall_pct >= 75:
-            motivation = "⭐ Excellent progress! You're almost there!"
-            next_action = "Just a little more push to reach 100%!"
-        elif overall_pct >= 50:
-            motivation = "👍 Good progress! You're on the right track!"
-            next_action = f"Focus on the remaining targets with {days_remaining} days left!"
-        elif overall_pct >= 25:
-            motivation = "📈 Making progress! Keep pushing forward!"
-            next_action = f"Increase your efforts - {days_remaining} days remaining!"
-        else:
-            motivation = "🚀 Time to accelerate! You've got this!"
-            next_action = f"Focus and push hard - {days_remaining} days left!"
-        
-        # Build complete message
-        message = (
-            f"📊 **KPI Progress - {month_name}**\n\n"
-            f"👋 Hello {user_data['name']}!\n\n"
-            f"{progress_summary}\n\n"
-            f"📅 **Time Remaining:** {days_remaining} days\n\n"
-            f"💪 **{motivation}**\n"
-            f"🎯 {next_action}\n\n"
-            "💡 **Quick Actions:**\n"
-            "🤝 /submitkpi - Submit meetup records\n"
-            "💰 /submitsale - Submit sales records"
-        )
-        
+        message = _KPI_NO_TARGETS_TEMPLATE.format(month_name=month_name, name=user_data['name'].translate(_MD_ESCAPE))
         await update.message.reply_text(message, parse_mode='Markdown')
-        
-        logger.info(f"KPI progress displayed for user {user_id} ({user_data['name']})")
-        
-    except Exception as e:
-        logger.error(f"Error in kpi_command: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("kpi_display", "Failed to retrieve KPI progress.")
-        )
+        return
+    
+    # Format progress display
+    month_name = now.strftime("%B %Y")
+    
+    # Create progress summary using utility function
+    progress_summary = utils.format_progress_summary(
+        progress['current_meetups'],
+        progress['meetup_target'],
+        progress['current_sales'],
+        progress['sales_target']
+    )
+    
+    # Calculate days remaining in month
+    days_in_month = _days_in_month(current_year, current_month)
+    days_remaining = days_in_month - now.day
+    
+    # Determine motivational message based on progress
+    overall_pct = (progress['meetup_percentage'] + progress['sales_percentage']) / 2
+    motivation, next_action = get_kpi_motivation_message(overall_pct, days_remaining)
+    
+    # Build complete message
+    message = _KPI_PROGRESS_TEMPLATE.format_map({
+        'month_name': month_name,
+        'name': user_data['name'].translate(_MD_ESCAPE),
+        'progress_summary': progress_summary,
+        'days_remaining': days_remaining,
+        'motivation': motivation,
+        'next_action': next_action
+    })
+    
+    await update.message.reply_text(message, parse_mode='Markdown')
+    
+    logger.info("KPI progress displayed for user %s (%s)", user_id, user_data['name'])
 
 def format_kpi_display(progress: Dict[str, Any], user_name: str, month_name: str) -> str:
     """
@@ -566,45 +899,25 @@ def format_kpi_display(progress: Dict[str, Any], user_name: str, month_name: str
         overall_pct = (progress['meetup_percentage'] + progress['sales_percentage']) / 2
         
         # Determine overall status
-        if overall_pct >= 100:
-            overall_emoji = "🏆"
-            overall_status = "All targets achieved!"
-        elif overall_pct >= 75:
-            overall_emoji = "⭐"
-            overall_status = "Excellent progress!"
-        elif overall_pct >= 50:
-            overall_emoji = "👍"
-            overall_status = "Good progress!"
-        elif overall_pct >= 25:
-            overall_emoji = "📈"
-            overall_status = "Making progress!"
-        else:
-            overall_emoji = "🚀"
-            overall_status = "Just getting started!"
-        
-        # Format currency for sales
-        sales_current_formatted = utils.format_currency(progress['current_sales'])
-        sales_target_formatted = utils.format_currency(progress['sales_target'])
+        overall_emoji, overall_status = _OVERALL_STATUSES[bisect.bisect_right(_PROGRESS_THRESHOLDS, overall_pct)]
         
         # Build the display
-        display = (
-            f"📊 **KPI Progress - {month_name}**\n\n"
-            f"👋 Hello {user_name}!\n\n"
-            f"🤝 **Meetups:**\n"
-            f"{meetup_bar}\n"
-            f"Target: {progress['meetup_target']} meetups\n"
-            f"Current: {progress['current_meetups']} meetups\n\n"
-            f"💰 **Sales:**\n"
-            f"{sales_bar}\n"
-            f"Target: {sales_target_formatted}\n"
-            f"Current: {sales_current_formatted}\n\n"
-            f"{overall_emoji} **Overall:** {overall_status} ({overall_pct:.1f}%)"
-        )
-        
-        return display
+        return _KPI_DISPLAY_TEMPLATE.format_map({
+            'month_name': month_name,
+            'user_name': user_name.translate(_MD_ESCAPE),
+            'meetup_bar': meetup_bar,
+            'meetup_target': progress['meetup_target'],
+            'current_meetups': progress['current_meetups'],
+            'sales_bar': sales_bar,
+            'sales_target': utils.format_currency(progress['sales_target']),
+            'current_sales': utils.format_currency(progress['current_sales']),
+            'overall_emoji': overall_emoji,
+            'overall_status': overall_status,
+            'overall_pct': overall_pct
+        })
         
     except Exception as e:
-        logger.error(f"Error formatting KPI display: {e}")
+        logger.error("Error formatting KPI display: %s", e)
         return "❌ Error formatting KPI display"
 
 def get_kpi_motivation_message(progress_percentage: float, days_remaining: int) -> tuple:
@@ -618,29 +931,129 @@ def get_kpi_motivation_message(progress_percentage: float, days_remaining: int)
     Returns:
         tuple: (motivation_message, next_action_message)
     """
-    if progress_percentage >= 100:
-        motivation = "🏆 Outstanding! You've achieved all your targets!"
-        next_action = "Keep up the excellent work and help your teammates!"
-    elif progress_percentage >= 75:
-        motivation = "⭐ Excellent progress! You're almost there!"
-        next_action = "Just a little more push to reach 100%!"
-    elif progress_percentage >= 50:
-        motivation = "👍 Good progress! You're on the right track!"
-        next_action = f"Focus on the remaining targets with {days_remaining} days left!"
-    elif progress_percentage >= 25:
-        motivation = "📈 Making progress! Keep pushing forward!"
-        next_action = f"Increase your efforts - {days_remaining} days remaining!"
-    else:
-        motivation = "🚀 Time to accelerate! You've got this!"
-        next_action = f"Focus and push hard - {days_remaining} days left!"
-    
-    return motivation, next_action
+    motivation, next_action = _MOTIVATIONS[bisect.bisect_right(_PROGRESS_THRESHOLDS, progress_percentage)]
+    return motivation, next_action.format(days=days_remaining)
 
 # Meetup KPI Submission Handler
 # Conversation states for meetup submission
 MEETUP_CLIENT_COUNT, MEETUP_PHOTO_UPLOAD = range(2)
 
+class MeetupCtx:
+    """State of one meetup submission, stored under context.user_data['meetup']"""
+    __slots__ = ('user_id', 'user_name', 'client_count', 'start_time')
+    
+    def __init__(self, user_id: int, user_name: str, client_count: int = 0, start_time: float = 0.0):
+        self.user_id = user_id
+        self.user_name = user_name
+        self.client_count = client_count
+        self.start_time = start_time
+
+# Client count validation messages
+_CLIENT_COUNT_INVALID = (
+    "⚠️ Please enter a valid number.\n\n"
+    "Example: 3 (for three clients)\n\n"
+    "Enter the number of clients:"
+)
+_CLIENT_COUNT_TOO_LOW = (
+    "⚠️ Please enter a positive number (at least 1).\n\n"
+    "Enter the number of clients:"
+)
+_CLIENT_COUNT_TOO_HIGH = (
+    "⚠️ That seems like a very high number. Please enter a realistic number (maximum 100).\n\n"
+    "Enter the number of clients:"
+)
+
+# Meetup submission messages
+_MEETUP_NOT_REGISTERED_TEMPLATE = (
+    "🚫 **Not Registered**\n\n"
+    "Hello {user_name}! You need to register first before submitting KPI records.\n\n"
+    "📝 Use /register to get started"
+)
+_MEETUP_START_TEMPLATE = (
+    "{greeting_emoji} **Meetup KPI Submission**\n\n"
+    "Hello {name}! Let's record your meetup activity.\n\n"
+    "🤝 **Step 1:** Enter the number of clients you met with today.\n\n"
+    "💡 **Tip:** Enter a positive number (e.g., 3 for three clients)\n\n"
+    "Please enter the **number of clients**:"
+)
+_CLIENT_COUNT_ACCEPTED_TEMPLATE = (
+    "✅ Great! You met with **{count}** {clients}.\n\n"
+    "📸 **Step 2:** Please upload a photo as proof of your meetup.\n\n"
+    "💡 **Tips:**\n"
+    "• Take a photo during or after the meetup\n"
+    "• Make sure the image is clear and relevant\n"
+    "• Supported formats: JPG, PNG\n\n"
+    "Please **upload your photo**:"
+)
+_MEETUP_PROCESSING_MSG = (
+    "⏳ **Processing your submission...**\n\n"
+    "📸 Uploading photo to secure storage...\n"
+    "💾 Saving your KPI record...\n\n"
+    "Please wait a moment..."
+)
+_PHOTO_UPLOAD_FAILED_PREFIX = (
+    "❌ **Photo Upload Failed**\n\n"
+    "We couldn't upload your photo to secure storage.\n"
+    "This might be due to:\n"
+    "• Network connectivity issues\n"
+    "• File size too large\n"
+    "• Temporary server issues\n\n"
+)
+_MEETUP_PHOTO_PROMPT_MSG = (
+    "📸 Please upload a photo to complete your meetup submission.\n\n"
+    "💡 How to upload:\n"
+    "• Tap the attachment button (📎)\n"
+    "• Select 'Photo' or 'Camera'\n"
+    "• Choose or take your photo\n\n"
+    "Please upload your photo:"
+)
+_MEETUP_CANCEL_MSG = (
+    "❌ **Meetup Submission Cancelled**\n\n"
+    "Your meetup submission has been cancelled.\n"
+    "No data has been saved.\n\n"
+    "🔄 You can start a new submission anytime using /submitkpi"
+)
+_MEETUP_UPLOAD_FAILED_MSG = _PHOTO_UPLOAD_FAILED_PREFIX + "🔄 Please try again with /submitkpi"
+_MEETUP_SUCCESS_TEMPLATE = (
+    "🎉 **Meetup KPI Submitted Successfully!**\n\n"
+    "✅ **Recorded:** {count} {clients} met\n"
+    "📸 **Photo:** Uploaded and secured\n"
+    "📅 **Date:** {date}\n\n"
+    "{progress}"
+    "🚀 **Keep up the great work!**\n\n"
+    "💡 **Next Steps:**\n"
+    "📊 /kpi - View your complete progress\n"
+    "💰 /submitsale - Submit sales records\n"
+    "🤝 /submitkpi - Submit more meetups"
+)
+_MEETUP_PROGRESS_TEMPLATE = (
+    "📊 **Updated Progress:**\n"
+    "🤝 Meetups: {bar}\n\n"
+)
+_MEETUP_PARTIAL_SUCCESS_TEMPLATE = (
+    "⚠️ **Partial Success**\n\n"
+    "📸 Your photo was uploaded successfully, but we couldn't save the KPI record.\n\n"
+    "📞 Please contact your administrator to manually record:\n"
+    "• **User:** {user_name}\n"
+    "• **Clients:** {count}\n"
+    "• **Date:** {date}\n"
+    "• **Photo:** {photo_link}\n\n"
+    "🔄 You can also try submitting again with /submitkpi"
+)
+
+def cleanup_meetup_context(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Clean up meetup submission context data
+    
+    Args:
+        context (ContextTypes.DEFAULT_TYPE): Telegram context
+    """
+    context.user_data.pop('meetup', None)
+    
+    logger.info("Cleaned up meetup submission context data")
+
 @auth.require_sales
+@_handler_guard("kpi_submission", "Failed to start meetup submission process.")
 async def submit_kpi_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Start meetup KPI submission conversation
@@ -652,48 +1065,35 @@ async def submit_kpi_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Returns:
         int: Next conversation state
     """
-    try:
-        user_id = update.effective_user.id
-        user_name = update.effective_user.first_name or "User"
-        
-        # Check if user is registered
-        user_data = google_sheets.get_user_by_id(user_id)
-        if not user_data:
-            message = (
-                "🚫 **Not Registered**\n\n"
-                f"Hello {user_name}! You need to register first before submitting KPI records.\n\n"
-                "📝 Use /register to get started"
-            )
-            await update.message.reply_text(message, parse_mode='Markdown')
-            return ConversationHandler.END
-        
-        # Start meetup submission process
-        greeting_emoji = utils.get_greeting_emoji()
-        message = (
-            f"{greeting_emoji} **Meetup KPI Submission**\n\n"
-            f"Hello {user_data['name']}! Let's record your meetup activity.\n\n"
-            "🤝 **Step 1:** Enter the number of clients you met with today.\n\n"
-            "💡 **Tip:** Enter a positive number (e.g., 3 for three clients)\n\n"
-            "Please enter the **number of clients**:"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        # Store user data in context for later use
-        context.user_data['meetup_user_id'] = user_id
-        context.user_data['meetup_user_name'] = user_data['name']
-        context.user_data['meetup_start_time'] = datetime.now()
-        
-        logger.info(f"Started meetup KPI submission for user {user_id} ({user_data['name']})")
-        return MEETUP_CLIENT_COUNT
-        
-    except Exception as e:
-        logger.error(f"Error in submit_kpi_command: {e}")
+    user_id = update.effective_user.id
+    user_name = update.effective_user.first_name or "User"
+    
+    # Check if user is registered
+    user_data = await _cached_get_user(user_id)
+    if not user_data:
         await update.message.reply_text(
-            utils.format_error_message("kpi_submission", "Failed to start meetup submission process.")
+            _MEETUP_NOT_REGISTERED_TEMPLATE.format(user_name=user_name.translate(_MD_ESCAPE)),
+            parse_mode='Markdown'
         )
         return ConversationHandler.END
+    
+    # Start meetup submission process
+    message = _MEETUP_START_TEMPLATE.format(
+        greeting_emoji=utils.get_greeting_emoji(),
+        name=user_data['name'].translate(_MD_ESCAPE)
+    )
+    
+    await update.message.reply_text(message, parse_mode='Markdown')
+    
+    # Store user data in context for later use
+    context.user_data['meetup'] = MeetupCtx(
+        user_id, user_data['name'], start_time=time.monotonic()
+    )
+    
+    logger.info("Started meetup KPI submission for user %s (%s)", user_id, user_data['name'])
+    return MEETUP_CLIENT_COUNT
 
+@_handler_guard("validation", "Failed to process client count input.", MEETUP_CLIENT_COUNT)
 async def meetup_client_count(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle client count input for meetup submission
@@ -705,111 +1105,64 @@ async def meetup_client_count(update: Update, context: ContextTypes.DEFAULT_TYPE
     Returns:
         int: Next conversation state
     """
-    try:
-        client_count_text = update.message.text.strip()
-        
-        # Validate client count input
-        try:
-            client_count = int(client_count_text)
-        except ValueError:
-            await update.message.reply_text(
-                "⚠️ Please enter a valid number.\n\n"
-                "Example: 3 (for three clients)\n\n"
-                "Enter the **number of clients**:"
-            )
-            return MEETUP_CLIENT_COUNT
-        
-        if client_count < 1:
-            await update.message.reply_text(
-                "⚠️ Please enter a positive number (at least 1).\n\n"
-                "Enter the **number of clients**:"
-            )
-            return MEETUP_CLIENT_COUNT
-        
-        if client_count > 100:
-            await update.message.reply_text(
-                "⚠️ That seems like a very high number. Please enter a realistic number (maximum 100).\n\n"
-                "Enter the **number of clients**:"
-            )
-            return MEETUP_CLIENT_COUNT
-        
-        # Store client count in context
-        context.user_data['meetup_client_count'] = client_count
-        
-        message = (
-            f"✅ Great! You met with **{client_count}** client{'s' if client_count > 1 else ''}.\n\n"
-            "📸 **Step 2:** Please upload a photo as proof of your meetup.\n\n"
-            "💡 **Tips:**\n"
-            "• Take a photo during or after the meetup\n"
-            "• Make sure the image is clear and relevant\n"
-            "• Supported formats: JPG, PNG\n\n"
-            "Please **upload your photo**:"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        logger.info(f"Meetup client count collected for user {context.user_data.get('meetup_user_id')}: {client_count}")
-        return MEETUP_PHOTO_UPLOAD
-        
-    except Exception as e:
-        logger.error(f"Error in meetup_client_count: {e}")
+    client_count_text = update.message.text.strip()
+    
+    # Validate client count input; a negative number is reported as too low
+    digits = client_count_text[1:] if client_count_text[:1] == '-' else client_count_text
+    if not digits.isdecimal():
+        await update.message.reply_text(_CLIENT_COUNT_INVALID)
+        return MEETUP_CLIENT_COUNT
+    
+    client_count = int(client_count_text)
+    if not 1 <= client_count <= 100:
         await update.message.reply_text(
-            utils.format_error_message("validation", "Failed to process client count input.")
+            _CLIENT_COUNT_TOO_LOW if client_count < 1 else _CLIENT_COUNT_TOO_HIGH
         )
         return MEETUP_CLIENT_COUNT
+    
+    # Store client count in context
+    ctx = context.user_data['meetup']
+    ctx.client_count = client_count
+    
+    message = _CLIENT_COUNT_ACCEPTED_TEMPLATE.format(
+        count=client_count,
+        clients="client" if client_count == 1 else "clients"
+    )
+    
+    await update.message.reply_text(message, parse_mode='Markdown')
+    
+    logger.info("Meetup client count collected for user %s: %s", ctx.user_id, client_count)
+    return MEETUP_PHOTO_UPLOAD
 
-async def meetup_photo_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def _finalize_meetup_submission(processing_message: Message, photo: PhotoSize,
+                                      user_id: int, user_name: str, client_count: int,
+                                      timestamp: datetime) -> None:
     """
-    Handle photo upload for meetup submission and complete the process
+    Upload a meetup photo, record the submission and report the outcome
+    
+    Runs as a background task started by meetup_photo_upload; every outcome
+    is reported by editing the processing message.
     
     Args:
-        update (Update): Telegram update object
-        context (ContextTypes.DEFAULT_TYPE): Telegram context
-        
-    Returns:
-        int: ConversationHandler.END
+        processing_message (Message): Message to edit with the outcome
+        photo (PhotoSize): Largest size of the submitted photo
+        user_id (int): Submitting user's Telegram ID
+        user_name (str): Submitting user's registered name
+        client_count (int): Number of clients met
+        timestamp (datetime): Submission time, used as the record date
     """
     try:
-        # Check if message contains a photo
-        if not update.message.photo:
-            await update.message.reply_text(
-                "📸 Please upload a photo to complete your meetup submission.\n\n"
-                "💡 **How to upload:**\n"
-                "• Tap the attachment button (📎)\n"
-                "• Select 'Photo' or 'Camera'\n"
-                "• Choose or take your photo\n\n"
-                "Please **upload your photo**:"
-            )
-            return MEETUP_PHOTO_UPLOAD
+        # Get Telegram file
+        telegram_file = await photo.get_file()
         
-        # Get the largest photo size
-        photo = update.message.photo[-1]
-        user_id = context.user_data['meetup_user_id']
-        client_count = context.user_data['meetup_client_count']
-        user_name = context.user_data['meetup_user_name']
+        # Generate filename
+        filename = utils.generate_photo_filename(user_id, 'meetup', timestamp)
         
-        # Send processing message
-        processing_message = await update.message.reply_text(
-            "⏳ **Processing your submission...**\n\n"
-            "📸 Uploading photo to secure storage...\n"
-            "💾 Saving your KPI record...\n\n"
-            "Please wait a moment..."
-        )
+        # Upload photo to Google Drive with memory management
+        logger.info("Starting photo upload for meetup submission: %s", filename)
         
-        try:
-            # Get Telegram file
-            telegram_file = await photo.get_file()
-            
-            # Generate filename
-            timestamp = datetime.now()
-            filename = utils.generate_photo_filename(user_id, 'meetup', timestamp)
-            
-            # Upload photo to Google Drive with memory management
-            logger.info(f"Starting photo upload for meetup submission: {filename}")
-            
-            # Import google_drive here to avoid circular imports
-            import google_drive
-            
+        state = _loop_state()
+        async with state.drive_semaphore, state.google_write_limiter:
             photo_link = await google_drive.upload_photo_from_telegram(
                 telegram_file, 
                 filename, 
@@ -817,113 +1170,75 @@ async def meetup_photo_upload(update: Update, context: ContextTypes.DEFAULT_TYPE
                 timestamp.year,
                 timestamp.month
             )
-            
-            if not photo_link:
-                # Photo upload failed
-                await processing_message.edit_text(
-                    "❌ **Photo Upload Failed**\n\n"
-                    "We couldn't upload your photo to secure storage.\n"
-                    "This might be due to:\n"
-                    "• Network connectivity issues\n"
-                    "• File size too large\n"
-                    "• Temporary server issues\n\n"
-                    "🔄 Please try again with /submitkpi"
-                )
-                
-                # Clean up context data
-                cleanup_meetup_context(context)
-                return ConversationHandler.END
-            
-            # Record KPI submission in Google Sheets
-            logger.info(f"Recording meetup KPI submission for user {user_id}")
-            
-            record_success = google_sheets.record_kpi_submission(
+        
+        if not photo_link:
+            # Photo upload failed
+            await processing_message.edit_text(_MEETUP_UPLOAD_FAILED_MSG)
+            return
+        
+        # Record KPI submission in Google Sheets
+        logger.info("Recording meetup KPI submission for user %s", user_id)
+        
+        async with _user_lock(user_id), state.google_write_limiter:
+            record_success = await asyncio.to_thread(
+                google_sheets.record_kpi_submission,
                 user_id=user_id,
                 record_type='meetup',
                 value=client_count,
                 photo_link=photo_link,
                 record_date=timestamp
             )
-            
-            if record_success:
-                # Get updated progress for display
-                current_month = timestamp.month
-                current_year = timestamp.year
-                progress = google_sheets.calculate_user_progress(user_id, current_month, current_year)
-                
-                # Build success message
-                success_message = (
-                    "🎉 **Meetup KPI Submitted Successfully!**\n\n"
-                    f"✅ **Recorded:** {client_count} client{'s' if client_count > 1 else ''} met\n"
-                    f"📸 **Photo:** Uploaded and secured\n"
-                    f"📅 **Date:** {timestamp.strftime('%B %d, %Y at %I:%M %p')}\n\n"
-                )
-                
-                # Add progress update if available
-                if progress:
-                    meetup_progress = utils.format_progress_bar(
-                        progress['current_meetups'],
-                        progress['meetup_target']
-                    )
-                    success_message += (
-                        f"📊 **Updated Progress:**\n"
-                        f"🤝 Meetups: {meetup_progress}\n\n"
-                    )
-                
-                success_message += (
-                    "🚀 **Keep up the great work!**\n\n"
-                    "💡 **Next Steps:**\n"
-                    "📊 /kpi - View your complete progress\n"
-                    "💰 /submitsale - Submit sales records\n"
-                    "🤝 /submitkpi - Submit more meetups"
-                )
-                
-                await processing_message.edit_text(success_message, parse_mode='Markdown')
-                
-                logger.info(f"Meetup KPI submission completed successfully for user {user_id} ({user_name})")
-                
-            else:
-                # KPI record failed to save
-                await processing_message.edit_text(
-                    "⚠️ **Partial Success**\n\n"
-                    "📸 Your photo was uploaded successfully, but we couldn't save the KPI record.\n\n"
-                    "📞 Please contact your administrator to manually record:\n"
-                    f"• **User:** {user_name}\n"
-                    f"• **Clients:** {client_count}\n"
-                    f"• **Date:** {timestamp.strftime('%B %d, %Y')}\n"
-                    f"• **Photo:** {photo_link}\n\n"
-                    "🔄 You can also try submitting again with /submitkpi"
-                )
-                
-                logger.error(f"Failed to record KPI submission for user {user_id}, but photo uploaded: {photo_link}")
-        
-        except Exception as upload_error:
-            logger.error(f"Error during photo upload/processing: {upload_error}")
-            await processing_message.edit_text(
-                utils.format_error_message("upload", "Failed to process photo upload.")
-            )
-        
-        # Clean up context data
-        cleanup_meetup_context(context)
         
-        # Force garbage collection to clean up memory
-        gc.collect()
-        
-        return ConversationHandler.END
-        
-    except Exception as e:
-        logger.error(f"Error in meetup_photo_upload: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("kpi_submission", "Failed to complete meetup submission.")
+        if record_success:
+            # Get updated progress for display; drop the cached entry first so
+            # it is read back from Google Sheets including this record
+            current_month = timestamp.month
+            current_year = timestamp.year
+            _invalidate_cached_progress(user_id, current_month, current_year)
+            progress = await _cached_user_progress(user_id, current_month, current_year)
+            
+            # Add progress update if a meetup target is set
+            progress_text = ""
+            if progress:
+                target = progress.get('meetup_target', 0)
+                if target > 0:
+                    progress_text = _MEETUP_PROGRESS_TEMPLATE.format(bar=utils.format_progress_bar(
+                        progress.get('current_meetups', 0), target
+                    ))
+            
+            # Build success message
+            success_message = _MEETUP_SUCCESS_TEMPLATE.format_map({
+                'count': client_count,
+                'clients': "client" if client_count == 1 else "clients",
+                'date': utils.format_datetime_display(timestamp),
+                'progress': progress_text
+            })
+            
+            await processing_message.edit_text(success_message, parse_mode='Markdown')
+            
+            logger.info("Meetup KPI submission completed successfully for user %s (%s)", user_id, user_name)
+            
+        else:
+            # KPI record failed to save
+            await processing_message.edit_text(_MEETUP_PARTIAL_SUCCESS_TEMPLATE.format_map({
+                'user_name': user_name,
+                'count': client_count,
+                'date': utils.format_datetime_display(timestamp, include_time=False),
+                'photo_link': photo_link
+            }))
+            
+            logger.error("Failed to record KPI submission for user %s, but photo uploaded: %s", user_id, photo_link)
+    
+    except Exception as upload_error:
+        logger.error("Error during photo upload/processing: %s", upload_error)
+        await processing_message.edit_text(
+            utils.format_error_message("upload", "Failed to process photo upload.")
         )
-        
-        # Clean up context data on error
-        cleanup_meetup_context(context)
-        return ConversationHandler.END
 
-async def meetup_submission_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+@_handler_guard("kpi_submission", "Failed to complete meetup submission.", cleanup=cleanup_meetup_context)
+async def meetup_photo_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
-    Handle meetup submission cancellation
+    Handle photo upload for meetup submission and hand it to a background task
     
     Args:
         update (Update): Telegram update object
@@ -932,50 +1247,50 @@ async def meetup_submission_cancel(update: Update, context: ContextTypes.DEFAULT
     Returns:
         int: ConversationHandler.END
     """
-    try:
-        user_id = update.effective_user.id if update.effective_user else "Unknown"
-        
-        message = (
-            "❌ **Meetup Submission Cancelled**\n\n"
-            "Your meetup submission has been cancelled.\n"
-            "No data has been saved.\n\n"
-            "🔄 You can start a new submission anytime using /submitkpi"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        # Clean up context data
-        cleanup_meetup_context(context)
-        
-        logger.info(f"Meetup submission cancelled by user {user_id}")
-        
-        # Force garbage collection
-        gc.collect()
-        
-        return ConversationHandler.END
-        
-    except Exception as e:
-        logger.error(f"Error in meetup_submission_cancel: {e}")
-        return ConversationHandler.END
+    # Check if message contains a photo
+    if not update.message.photo:
+        await update.message.reply_text(_MEETUP_PHOTO_PROMPT_MSG)
+        return MEETUP_PHOTO_UPLOAD
+    
+    # Get the largest photo size
+    photo = update.message.photo[-1]
+    ctx = context.user_data['meetup']
+    timestamp = utils.current_time()
+    
+    # Send processing message; the upload and record finish in the background
+    # and edit it with the outcome, so the conversation ends right away
+    processing_message = await update.message.reply_text(_MEETUP_PROCESSING_MSG)
+    context.application.create_task(_finalize_meetup_submission(
+        processing_message, photo, ctx.user_id, ctx.user_name, ctx.client_count, timestamp
+    ), update=update)
+    
+    # Clean up context data
+    cleanup_meetup_context(context)
+    
+    return ConversationHandler.END
 
-def cleanup_meetup_context(context: ContextTypes.DEFAULT_TYPE) -> None:
+@_handler_guard(None, None)
+async def meetup_submission_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
-    Clean up meetup submission context data
+    Handle meetup submission cancellation
     
     Args:
+        update (Update): Telegram update object
         context (ContextTypes.DEFAULT_TYPE): Telegram context
-    """
-    try:
-        meetup_keys = [
-            'meetup_user_id', 'meetup_user_name', 'meetup_client_count', 'meetup_start_time'
-        ]
-        for key in meetup_keys:
-            context.user_data.pop(key, None)
-        
-        logger.info("Cleaned up meetup submission context data")
         
-    except Exception as e:
-        logger.error(f"Error cleaning up meetup context: {e}")
+    Returns:
+        int: ConversationHandler.END
+    """
+    user_id = update.effective_user.id if update.effective_user else "Unknown"
+    
+    await update.message.reply_text(_MEETUP_CANCEL_MSG, parse_mode='Markdown')
+    
+    # Clean up context data
+    cleanup_meetup_context(context)
+    
+    logger.info("Meetup submission cancelled by user %s", user_id)
+    
+    return ConversationHandler.END
 
 # Create meetup submission conversation handler
 def create_meetup_submission_handler() -> ConversationHandler:
@@ -986,14 +1301,14 @@ def create_meetup_submission_handler() -> ConversationHandler:
         ConversationHandler: Configured meetup submission conversation handler
     """
     return ConversationHandler(
-        entry_points=[CommandHandler('submitkpi', submit_kpi_command)],
+        entry_points=[CommandHandler('submitkpi', submit_kpi_command, block=False)],
         states={
             MEETUP_CLIENT_COUNT: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, meetup_client_count)
+                MessageHandler(_TEXT_NOT_CMD, meetup_client_count)
             ],
             MEETUP_PHOTO_UPLOAD: [
                 MessageHandler(filters.PHOTO, meetup_photo_upload),
-                MessageHandler(filters.TEXT & ~filters.COMMAND, meetup_photo_upload)
+                MessageHandler(_TEXT_NOT_CMD, meetup_photo_upload)
             ],
         },
         fallbacks=[
@@ -1010,7 +1325,125 @@ def create_meetup_submission_handler() -> ConversationHandler:
 # Conversation states for sales submission
 SALES_AMOUNT, SALES_PHOTO_UPLOAD = range(2)
 
+# Sales amount input: whole dollars with optional cents (sign allowed so a
+# negative amount gets the "positive amount" reply)
+_AMOUNT_RE = re.compile(r'-?\d+(?:\.\d{1,2})?')
+
+class SalesCtx:
+    """State of one sales submission, stored under context.user_data['sales']"""
+    __slots__ = ('user_id', 'user_name', 'amount', 'amount_display', 'start_time')
+    
+    def __init__(self, user_id: int, user_name: str, amount: float = 0.0,
+                 amount_display: str = '', start_time: float = 0.0):
+        self.user_id = user_id
+        self.user_name = user_name
+        self.amount = amount
+        self.amount_display = amount_display
+        self.start_time = start_time
+
+# Sales submission messages
+_SALES_NOT_REGISTERED_TEMPLATE = (
+    "🚫 **Not Registered**\n\n"
+    "Hello {user_name}! You need to register first before submitting sales records.\n\n"
+    "📝 Use /register to get started"
+)
+_SALES_START_TEMPLATE = (
+    "{greeting_emoji} **Sales KPI Submission**\n\n"
+    "Hello {name}! Let's record your sales achievement.\n\n"
+    "💰 **Step 1:** Enter the sales amount you achieved today.\n\n"
+    "💡 **Tips:**\n"
+    "• Enter amount in dollars (e.g., 1500 or 1500.50)\n"
+    "• Don't include currency symbols\n"
+    "• Use decimal point for cents if needed\n\n"
+    "Please enter the **sales amount**:"
+)
+_SALES_AMOUNT_INVALID = (
+    "⚠️ Please enter a valid number.\n\n"
+    "Examples:\n"
+    "• 1500 (for $1,500)\n"
+    "• 1500.50 (for $1,500.50)\n"
+    "• 250 (for $250)\n\n"
+    "Enter the sales amount:"
+)
+_SALES_AMOUNT_NEGATIVE = (
+    "⚠️ Please enter a positive amount.\n\n"
+    "Enter the sales amount:"
+)
+_SALES_AMOUNT_TOO_HIGH = (
+    "⚠️ That seems like a very high amount. Please enter a realistic sales amount (maximum $1,000,000).\n\n"
+    "Enter the sales amount:"
+)
+_SALES_AMOUNT_ACCEPTED_TEMPLATE = (
+    "✅ Excellent! You achieved **{amount}** in sales.\n\n"
+    "📸 **Step 2:** Please upload a photo as proof of your sale.\n\n"
+    "💡 **Tips:**\n"
+    "• Take a photo of the receipt, contract, or confirmation\n"
+    "• Make sure the image is clear and readable\n"
+    "• Include any relevant documentation\n"
+    "• Supported formats: JPG, PNG\n\n"
+    "Please **upload your photo**:"
+)
+_SALES_PROCESSING_MSG = (
+    "⏳ **Processing your sales submission...**\n\n"
+    "📸 Uploading photo to secure storage...\n"
+    "💾 Saving your sales record...\n\n"
+    "Please wait a moment..."
+)
+_SALES_PHOTO_PROMPT_MSG = (
+    "📸 Please upload a photo to complete your sales submission.\n\n"
+    "💡 How to upload:\n"
+    "• Tap the attachment button (📎)\n"
+    "• Select 'Photo' or 'Camera'\n"
+    "• Choose or take your photo\n\n"
+    "Please upload your photo:"
+)
+_SALES_CANCEL_MSG = (
+    "❌ **Sales Submission Cancelled**\n\n"
+    "Your sales submission has been cancelled.\n"
+    "No data has been saved.\n\n"
+    "🔄 You can start a new submission anytime using /submitsale"
+)
+_SALES_UPLOAD_FAILED_MSG = _PHOTO_UPLOAD_FAILED_PREFIX + "🔄 Please try again with /submitsale"
+_SALES_SUCCESS_TEMPLATE = (
+    "🎉 **Sales KPI Submitted Successfully!**\n\n"
+    "✅ **Recorded:** {amount} in sales\n"
+    "📸 **Photo:** Uploaded and secured\n"
+    "📅 **Date:** {date}\n\n"
+    "{progress}"
+    "🚀 **Outstanding achievement!**\n\n"
+    "💡 **Next Steps:**\n"
+    "📊 /kpi - View your complete progress\n"
+    "🤝 /submitkpi - Submit meetup records\n"
+    "💰 /submitsale - Submit more sales"
+)
+_SALES_PROGRESS_TEMPLATE = (
+    "📊 **Updated Progress:**\n"
+    "💰 Sales: {bar}\n\n"
+)
+_SALES_PARTIAL_SUCCESS_TEMPLATE = (
+    "⚠️ **Partial Success**\n\n"
+    "📸 Your photo was uploaded successfully, but we couldn't save the sales record.\n\n"
+    "📞 Please contact your administrator to manually record:\n"
+    "• **User:** {user_name}\n"
+    "• **Sales:** {amount}\n"
+    "• **Date:** {date}\n"
+    "• **Photo:** {photo_link}\n\n"
+    "🔄 You can also try submitting again with /submitsale"
+)
+
+def cleanup_sales_context(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Clean up sales submission context data
+    
+    Args:
+        context (ContextTypes.DEFAULT_TYPE): Telegram context
+    """
+    context.user_data.pop('sales', None)
+    
+    logger.info("Cleaned up sales submission context data")
+
 @auth.require_sales
+@_handler_guard("sales_submission", "Failed to start sales submission process.")
 async def submit_sale_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Start sales KPI submission conversation
@@ -1022,51 +1455,35 @@ async def submit_sale_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     Returns:
         int: Next conversation state
     """
-    try:
-        user_id = update.effective_user.id
-        user_name = update.effective_user.first_name or "User"
-        
-        # Check if user is registered
-        user_data = google_sheets.get_user_by_id(user_id)
-        if not user_data:
-            message = (
-                "🚫 **Not Registered**\n\n"
-                f"Hello {user_name}! You need to register first before submitting sales records.\n\n"
-                "📝 Use /register to get started"
-            )
-            await update.message.reply_text(message, parse_mode='Markdown')
-            return ConversationHandler.END
-        
-        # Start sales submission process
-        greeting_emoji = utils.get_greeting_emoji()
-        message = (
-            f"{greeting_emoji} **Sales KPI Submission**\n\n"
-            f"Hello {user_data['name']}! Let's record your sales achievement.\n\n"
-            "💰 **Step 1:** Enter the sales amount you achieved today.\n\n"
-            "💡 **Tips:**\n"
-            "• Enter amount in dollars (e.g., 1500 or 1500.50)\n"
-            "• Don't include currency symbols\n"
-            "• Use decimal point for cents if needed\n\n"
-            "Please enter the **sales amount**:"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        # Store user data in context for later use
-        context.user_data['sales_user_id'] = user_id
-        context.user_data['sales_user_name'] = user_data['name']
-        context.user_data['sales_start_time'] = datetime.now()
-        
-        logger.info(f"Started sales KPI submission for user {user_id} ({user_data['name']})")
-        return SALES_AMOUNT
-        
-    except Exception as e:
-        logger.error(f"Error in submit_sale_command: {e}")
+    user_id = update.effective_user.id
+    user_name = update.effective_user.first_name or "User"
+    
+    # Check if user is registered
+    user_data = await _cached_get_user(user_id)
+    if not user_data:
         await update.message.reply_text(
-            utils.format_error_message("sales_submission", "Failed to start sales submission process.")
+            _SALES_NOT_REGISTERED_TEMPLATE.format(user_name=user_name.translate(_MD_ESCAPE)),
+            parse_mode='Markdown'
         )
         return ConversationHandler.END
+    
+    # Start sales submission process
+    message = _SALES_START_TEMPLATE.format(
+        greeting_emoji=utils.get_greeting_emoji(),
+        name=user_data['name'].translate(_MD_ESCAPE)
+    )
+    
+    await update.message.reply_text(message, parse_mode='Markdown')
+    
+    # Store user data in context for later use
+    context.user_data['sales'] = SalesCtx(
+        user_id, user_data['name'], start_time=time.monotonic()
+    )
+    
+    logger.info("Started sales KPI submission for user %s (%s)", user_id, user_data['name'])
+    return SALES_AMOUNT
 
+@_handler_guard("validation", "Failed to process sales amount input.", SALES_AMOUNT)
 async def sales_amount_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Handle sales amount input for sales submission
@@ -1078,118 +1495,65 @@ async def sales_amount_input(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Returns:
         int: Next conversation state
     """
-    try:
-        sales_amount_text = update.message.text.strip()
-        
-        # Validate sales amount input
-        try:
-            sales_amount = float(sales_amount_text)
-        except ValueError:
-            await update.message.reply_text(
-                "⚠️ Please enter a valid number.\n\n"
-                "Examples:\n"
-                "• 1500 (for $1,500)\n"
-                "• 1500.50 (for $1,500.50)\n"
-                "• 250 (for $250)\n\n"
-                "Enter the **sales amount**:"
-            )
-            return SALES_AMOUNT
-        
-        if sales_amount < 0:
-            await update.message.reply_text(
-                "⚠️ Please enter a positive amount.\n\n"
-                "Enter the **sales amount**:"
-            )
-            return SALES_AMOUNT
-        
-        if sales_amount > 1000000:  # $1M limit for sanity check
-            await update.message.reply_text(
-                "⚠️ That seems like a very high amount. Please enter a realistic sales amount (maximum $1,000,000).\n\n"
-                "Enter the **sales amount**:"
-            )
-            return SALES_AMOUNT
-        
-        # Store sales amount in context
-        context.user_data['sales_amount'] = sales_amount
-        
-        # Format amount for display
-        formatted_amount = utils.format_currency(sales_amount)
-        
-        message = (
-            f"✅ Excellent! You achieved **{formatted_amount}** in sales.\n\n"
-            "📸 **Step 2:** Please upload a photo as proof of your sale.\n\n"
-            "💡 **Tips:**\n"
-            "• Take a photo of the receipt, contract, or confirmation\n"
-            "• Make sure the image is clear and readable\n"
-            "• Include any relevant documentation\n"
-            "• Supported formats: JPG, PNG\n\n"
-            "Please **upload your photo**:"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        logger.info(f"Sales amount collected for user {context.user_data.get('sales_user_id')}: ${sales_amount}")
-        return SALES_PHOTO_UPLOAD
-        
-    except Exception as e:
-        logger.error(f"Error in sales_amount_input: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("validation", "Failed to process sales amount input.")
-        )
+    sales_amount_text = update.message.text.strip()
+    
+    # Validate sales amount input; only a matching string reaches float()
+    if _AMOUNT_RE.fullmatch(sales_amount_text) is None:
+        await update.message.reply_text(_SALES_AMOUNT_INVALID)
+        return SALES_AMOUNT
+    
+    sales_amount = float(sales_amount_text)
+    if sales_amount < 0:
+        await update.message.reply_text(_SALES_AMOUNT_NEGATIVE)
+        return SALES_AMOUNT
+    
+    if sales_amount > 1000000:  # $1M limit for sanity check
+        await update.message.reply_text(_SALES_AMOUNT_TOO_HIGH)
         return SALES_AMOUNT
+    
+    # Store sales amount in context, with its display form for the photo step
+    formatted_amount = utils.format_currency(sales_amount)
+    ctx = context.user_data['sales']
+    ctx.amount = sales_amount
+    ctx.amount_display = formatted_amount
+    
+    message = _SALES_AMOUNT_ACCEPTED_TEMPLATE.format(amount=formatted_amount)
+    
+    await update.message.reply_text(message, parse_mode='Markdown')
+    
+    logger.info("Sales amount collected for user %s: $%s", ctx.user_id, sales_amount)
+    return SALES_PHOTO_UPLOAD
 
-async def sales_photo_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+async def _finalize_sales_submission(processing_message: Message, photo: PhotoSize,
+                                     user_id: int, user_name: str, sales_amount: float,
+                                     formatted_amount: str, timestamp: datetime) -> None:
     """
-    Handle photo upload for sales submission and complete the process
+    Upload a sales photo, record the submission and report the outcome
+    
+    Runs as a background task started by sales_photo_upload; every outcome
+    is reported by editing the processing message.
     
     Args:
-        update (Update): Telegram update object
-        context (ContextTypes.DEFAULT_TYPE): Telegram context
-        
-    Returns:
-        int: ConversationHandler.END
+        processing_message (Message): Message to edit with the outcome
+        photo (PhotoSize): Largest size of the submitted photo
+        user_id (int): Submitting user's Telegram ID
+        user_name (str): Submitting user's registered name
+        sales_amount (float): Sales amount achieved
+        formatted_amount (str): Sales amount formatted for display
+        timestamp (datetime): Submission time, used as the record date
     """
     try:
-        # Check if message contains a photo
-        if not update.message.photo:
-            await update.message.reply_text(
-                "📸 Please upload a photo to complete your sales submission.\n\n"
-                "💡 **How to upload:**\n"
-                "• Tap the attachment button (📎)\n"
-                "• Select 'Photo' or 'Camera'\n"
-                "• Choose or take your photo\n\n"
-                "Please **upload your photo**:"
-            )
-            return SALES_PHOTO_UPLOAD
+        # Get Telegram file
+        telegram_file = await photo.get_file()
         
-        # Get the largest photo size
-        photo = update.message.photo[-1]
-        user_id = context.user_data['sales_user_id']
-        sales_amount = context.user_data['sales_amount']
-        user_name = context.user_data['sales_user_name']
+        # Generate filename
+        filename = utils.generate_photo_filename(user_id, 'sale', timestamp)
         
-        # Send processing message
-        processing_message = await update.message.reply_text(
-            "⏳ **Processing your sales submission...**\n\n"
-            "📸 Uploading photo to secure storage...\n"
-            "💾 Saving your sales record...\n\n"
-            "Please wait a moment..."
-        )
+        # Upload photo to Google Drive with memory management
+        logger.info("Starting photo upload for sales submission: %s", filename)
         
-        try:
-            # Get Telegram file
-            telegram_file = await photo.get_file()
-            
-            # Generate filename
-            timestamp = datetime.now()
-            filename = utils.generate_photo_filename(user_id, 'sale', timestamp)
-            
-            # Upload photo to Google Drive with memory management
-            logger.info(f"Starting photo upload for sales submission: {filename}")
-            
-            # Import google_drive here to avoid circular imports
-            import google_drive
-            
+        state = _loop_state()
+        async with state.drive_semaphore, state.google_write_limiter:
             photo_link = await google_drive.upload_photo_from_telegram(
                 telegram_file, 
                 filename, 
@@ -1197,117 +1561,74 @@ async def sales_photo_upload(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 timestamp.year,
                 timestamp.month
             )
-            
-            if not photo_link:
-                # Photo upload failed
-                await processing_message.edit_text(
-                    "❌ **Photo Upload Failed**\n\n"
-                    "We couldn't upload your photo to secure storage.\n"
-                    "This might be due to:\n"
-                    "• Network connectivity issues\n"
-                    "• File size too large\n"
-                    "• Temporary server issues\n\n"
-                    "🔄 Please try again with /submitsale"
-                )
-                
-                # Clean up context data
-                cleanup_sales_context(context)
-                return ConversationHandler.END
-            
-            # Record KPI submission in Google Sheets
-            logger.info(f"Recording sales KPI submission for user {user_id}")
-            
-            record_success = google_sheets.record_kpi_submission(
+        
+        if not photo_link:
+            # Photo upload failed
+            await processing_message.edit_text(_SALES_UPLOAD_FAILED_MSG)
+            return
+        
+        # Record KPI submission in Google Sheets
+        logger.info("Recording sales KPI submission for user %s", user_id)
+        
+        async with _user_lock(user_id), state.google_write_limiter:
+            record_success = await asyncio.to_thread(
+                google_sheets.record_kpi_submission,
                 user_id=user_id,
                 record_type='sale',
                 value=sales_amount,
                 photo_link=photo_link,
                 record_date=timestamp
             )
-            
-            if record_success:
-                # Get updated progress for display
-                current_month = timestamp.month
-                current_year = timestamp.year
-                progress = google_sheets.calculate_user_progress(user_id, current_month, current_year)
-                
-                # Format amount for display
-                formatted_amount = utils.format_currency(sales_amount)
-                
-                # Build success message
-                success_message = (
-                    "🎉 **Sales KPI Submitted Successfully!**\n\n"
-                    f"✅ **Recorded:** {formatted_amount} in sales\n"
-                    f"📸 **Photo:** Uploaded and secured\n"
-                    f"📅 **Date:** {timestamp.strftime('%B %d, %Y at %I:%M %p')}\n\n"
-                )
-                
-                # Add progress update if available
-                if progress:
-                    sales_progress = utils.format_progress_bar(
-                        int(progress['current_sales']),
-                        int(progress['sales_target'])
-                    )
-                    success_message += (
-                        f"📊 **Updated Progress:**\n"
-                        f"💰 Sales: {sales_progress}\n\n"
-                    )
-                
-                success_message += (
-                    "🚀 **Outstanding achievement!**\n\n"
-                    "💡 **Next Steps:**\n"
-                    "📊 /kpi - View your complete progress\n"
-                    "🤝 /submitkpi - Submit meetup records\n"
-                    "💰 /submitsale - Submit more sales"
-                )
-                
-                await processing_message.edit_text(success_message, parse_mode='Markdown')
-                
-                logger.info(f"Sales KPI submission completed successfully for user {user_id} ({user_name})")
-                
-            else:
-                # KPI record failed to save
-                formatted_amount = utils.format_currency(sales_amount)
-                await processing_message.edit_text(
-                    "⚠️ **Partial Success**\n\n"
-                    "📸 Your photo was uploaded successfully, but we couldn't save the sales record.\n\n"
-                    "📞 Please contact your administrator to manually record:\n"
-                    f"• **User:** {user_name}\n"
-                    f"• **Sales:** {formatted_amount}\n"
-                    f"• **Date:** {timestamp.strftime('%B %d, %Y')}\n"
-                    f"• **Photo:** {photo_link}\n\n"
-                    "🔄 You can also try submitting again with /submitsale"
-                )
-                
-                logger.error(f"Failed to record sales KPI submission for user {user_id}, but photo uploaded: {photo_link}")
-        
-        except Exception as upload_error:
-            logger.error(f"Error during sales photo upload/processing: {upload_error}")
-            await processing_message.edit_text(
-                utils.format_error_message("upload", "Failed to process photo upload.")
-            )
-        
-        # Clean up context data
-        cleanup_sales_context(context)
         
-        # Force garbage collection to clean up memory
-        gc.collect()
-        
-        return ConversationHandler.END
-        
-    except Exception as e:
-        logger.error(f"Error in sales_photo_upload: {e}")
-        await update.message.reply_text(
-            utils.format_error_message("sales_submission", "Failed to complete sales submission.")
+        if record_success:
+            # Get updated progress for display; drop the cached entry first so
+            # it is read back from Google Sheets including this record
+            current_month = timestamp.month
+            current_year = timestamp.year
+            _invalidate_cached_progress(user_id, current_month, current_year)
+            progress = await _cached_user_progress(user_id, current_month, current_year)
+            
+            # Add progress update if a sales target is set
+            progress_text = ""
+            if progress:
+                target = int(progress.get('sales_target', 0))
+                if target > 0:
+                    progress_text = _SALES_PROGRESS_TEMPLATE.format(bar=utils.format_progress_bar(
+                        int(progress.get('current_sales', 0)), target
+                    ))
+            
+            # Build success message
+            success_message = _SALES_SUCCESS_TEMPLATE.format_map({
+                'amount': formatted_amount,
+                'date': utils.format_datetime_display(timestamp),
+                'progress': progress_text
+            })
+            
+            await processing_message.edit_text(success_message, parse_mode='Markdown')
+            
+            logger.info("Sales KPI submission completed successfully for user %s (%s)", user_id, user_name)
+            
+        else:
+            # KPI record failed to save
+            await processing_message.edit_text(_SALES_PARTIAL_SUCCESS_TEMPLATE.format_map({
+                'user_name': user_name,
+                'amount': formatted_amount,
+                'date': utils.format_datetime_display(timestamp, include_time=False),
+                'photo_link': photo_link
+            }))
+            
+            logger.error("Failed to record sales KPI submission for user %s, but photo uploaded: %s", user_id, photo_link)
+    
+    except Exception as upload_error:
+        logger.error("Error during sales photo upload/processing: %s", upload_error)
+        await processing_message.edit_text(
+            utils.format_error_message("upload", "Failed to process photo upload.")
         )
-        
-        # Clean up context data on error
-        cleanup_sales_context(context)
-        return ConversationHandler.END
 
-async def sales_submission_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+@_handler_guard("sales_submission", "Failed to complete sales submission.", cleanup=cleanup_sales_context)
+async def sales_photo_upload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
-    Handle sales submission cancellation
+    Handle photo upload for sales submission and hand it to a background task
     
     Args:
         update (Update): Telegram update object
@@ -1316,50 +1637,50 @@ async def sales_submission_cancel(update: Update, context: ContextTypes.DEFAULT_
     Returns:
         int: ConversationHandler.END
     """
-    try:
-        user_id = update.effective_user.id if update.effective_user else "Unknown"
-        
-        message = (
-            "❌ **Sales Submission Cancelled**\n\n"
-            "Your sales submission has been cancelled.\n"
-            "No data has been saved.\n\n"
-            "🔄 You can start a new submission anytime using /submitsale"
-        )
-        
-        await update.message.reply_text(message, parse_mode='Markdown')
-        
-        # Clean up context data
-        cleanup_sales_context(context)
-        
-        logger.info(f"Sales submission cancelled by user {user_id}")
-        
-        # Force garbage collection
-        gc.collect()
-        
-        return ConversationHandler.END
-        
-    except Exception as e:
-        logger.error(f"Error in sales_submission_cancel: {e}")
-        return ConversationHandler.END
+    # Check if message contains a photo
+    if not update.message.photo:
+        await update.message.reply_text(_SALES_PHOTO_PROMPT_MSG)
+        return SALES_PHOTO_UPLOAD
+    
+    # Get the largest photo size
+    photo = update.message.photo[-1]
+    ctx = context.user_data['sales']
+    timestamp = utils.current_time()
+    
+    # Send processing message; the upload and record finish in the background
+    # and edit it with the outcome, so the conversation ends right away
+    processing_message = await update.message.reply_text(_SALES_PROCESSING_MSG)
+    context.application.create_task(_finalize_sales_submission(
+        processing_message, photo, ctx.user_id, ctx.user_name, ctx.amount, ctx.amount_display, timestamp
+    ), update=update)
+    
+    # Clean up context data
+    cleanup_sales_context(context)
+    
+    return ConversationHandler.END
 
-def cleanup_sales_context(context: ContextTypes.DEFAULT_TYPE) -> None:
+@_handler_guard(None, None)
+async def sales_submission_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
-    Clean up sales submission context data
+    Handle sales submission cancellation
     
     Args:
+        update (Update): Telegram update object
         context (ContextTypes.DEFAULT_TYPE): Telegram context
-    """
-    try:
-        sales_keys = [
-            'sales_user_id', 'sales_user_name', 'sales_amount', 'sales_start_time'
-        ]
-        for key in sales_keys:
-            context.user_data.pop(key, None)
-        
-        logger.info("Cleaned up sales submission context data")
         
-    except Exception as e:
-        logger.error(f"Error cleaning up sales context: {e}")
+    Returns:
+        int: ConversationHandler.END
+    """
+    user_id = update.effective_user.id if update.effective_user else "Unknown"
+    
+    await update.message.reply_text(_SALES_CANCEL_MSG, parse_mode='Markdown')
+    
+    # Clean up context data
+    cleanup_sales_context(context)
+    
+    logger.info("Sales submission cancelled by user %s", user_id)
+    
+    return ConversationHandler.END
 
 # Create sales submission conversation handler
 def create_sales_submission_handler() -> ConversationHandler:
@@ -1370,14 +1691,14 @@ def create_sales_submission_handler() -> ConversationHandler:
         ConversationHandler: Configured sales submission conversation handler
     """
     return ConversationHandler(
-        entry_points=[CommandHandler('submitsale', submit_sale_command)],
+        entry_points=[CommandHandler('submitsale', submit_sale_command, block=False)],
         states={
             SALES_AMOUNT: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, sales_amount_input)
+                MessageHandler(_TEXT_NOT_CMD, sales_amount_input)
             ],
             SALES_PHOTO_UPLOAD: [
                 MessageHandler(filters.PHOTO, sales_photo_upload),
-                MessageHandler(filters.TEXT & ~filters.COMMAND, sales_photo_upload)
+                MessageHandler(_TEXT_NOT_CMD, sales_photo_upload)
             ],
         },
         fallbacks=[
@@ -1406,7 +1727,7 @@ def get_sales_handlers():
         
         # Add KPI viewing command handler
         from telegram.ext import CommandHandler
-        kpi_handler = CommandHandler('kpi', kpi_command)
+        kpi_handler = CommandHandler('kpi', kpi_command, block=False)
         handlers.append(kpi_handler)
         
         # Add meetup submission conversation handler
@@ -1417,9 +1738,9 @@ def get_sales_handlers():
         sales_handler = create_sales_submission_handler()
         handlers.append(sales_handler)
         
-        logger.info(f"Created {len(handlers)} sales handlers")
+        logger.info("Created %s sales handlers", len(handlers))
         return handlers
         
     except Exception as e:
-        logger.error(f"Error creating sales handlers: {e}")
+        logger.error("Error creating sales handlers: %s", e)
         return []
@@ -8,10 +8,18 @@ Run this script locally to generate the token.json file.
 
 import os
 import json
+from datetime import datetime, timedelta, timezone
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
+# Try to import orjson for faster JSON handling, fall back to the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Google API scopes
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -21,6 +29,32 @@ SCOPES = [
 TOKEN_FILE = 'token.json'
 CREDENTIALS_FILE = 'credentials.json'
 
+# Tokens this close to expiry are refreshed rather than reused
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+def load_token():
+    """Load credentials from token.json, or None if it does not exist"""
+    if not os.path.exists(TOKEN_FILE):
+        return None
+    return Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+
+def is_fresh(creds):
+    """Check that credentials are valid and not about to expire"""
+    if not (creds and creds.valid):
+        return False
+    if creds.expiry is None:
+        return True
+    now = datetime.now(timezone.utc)
+    if creds.expiry.tzinfo is None:
+        # google-auth keeps expiry as naive UTC
+        now = now.replace(tzinfo=None)
+    return creds.expiry - now > TOKEN_REFRESH_MARGIN
+
+def get_valid_creds():
+    """Return fresh credentials from token.json without touching the network, or None"""
+    creds = load_token()
+    return creds if is_fresh(creds) else None
+
 def setup_oauth():
     """Set up OAuth authentication and generate token.json"""
     
@@ -40,21 +74,21 @@ def setup_oauth():
         print("7. Place it in the same directory as this script")
         return False
     
-    creds = None
+    # Reuse an existing token that is valid for a while yet
+    creds = get_valid_creds()
+    if creds is not None:
+        print(f"📄 Found existing {TOKEN_FILE}")
+        print("✅ Existing token is valid!")
+        print_token_info(creds)
+        return True
     
     # Check if token.json already exists
-    if os.path.exists(TOKEN_FILE):
+    creds = load_token()
+    if creds is not None:
         print(f"📄 Found existing {TOKEN_FILE}")
-        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
         
-        # Check if credentials are valid
-        if creds and creds.valid:
-            print("✅ Existing token is valid!")
-            print_token_info(creds)
-            return True
-        
-        # Try to refresh expired token
-        if creds and creds.expired and creds.refresh_token:
+        # Try to refresh an expired or expiring token
+        if creds.refresh_token:
             print("🔄 Token expired, trying to refresh...")
             try:
                 creds.refresh(Request())
@@ -86,8 +120,13 @@ def setup_oauth():
 
 def save_token(creds):
     """Save credentials to token.json"""
-    with open(TOKEN_FILE, 'w') as token:
+    # Write to a temp file and swap it in so a crash never leaves a truncated token
+    tmp_path = TOKEN_FILE + '.tmp'
+    with open(tmp_path, 'w', buffering=8192) as token:
         token.write(creds.to_json())
+        token.flush()
+        os.fsync(token.fileno())
+    os.replace(tmp_path, TOKEN_FILE)
     print(f"💾 Token saved to {TOKEN_FILE}")
 
 def print_token_info(creds):
@@ -100,6 +139,12 @@ def print_token_info(creds):
     if hasattr(creds, 'expiry') and creds.expiry:
         print(f"   Expires: {creds.expiry}")
 
+def minify_json(text):
+    """Re-emit a JSON document without insignificant whitespace"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(orjson.loads(text)).decode()
+    return json.dumps(json.loads(text), separators=(',', ':'))
+
 def generate_env_token():
     """Generate token for environment variable"""
     if not os.path.exists(TOKEN_FILE):
@@ -119,9 +164,7 @@ def generate_env_token():
     
     print("\n💡 Or use this one-liner format:")
     # Minify JSON for easier copying
-    token_obj = json.loads(token_data)
-    minified = json.dumps(token_obj, separators=(',', ':'))
-    print(minified)
+    print(minify_json(token_data))
 
 def main():
     """Main function"""
@@ -147,8 +190,8 @@ def main():
         generate_env_token()
     
     elif choice == '3':
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        creds = load_token()
+        if creds is not None:
             print_token_info(creds)
         else:
             print(f"❌ {TOKEN_FILE} not found")
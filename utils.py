@@ -9,9 +9,13 @@ This module provides shared functionality including:
 - Data validation helpers
 """
 
+import bisect
+import functools
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # Try to import telegram components, gracefully handle if not available
 try:
@@ -21,11 +25,15 @@ except ImportError:
     TELEGRAM_AVAILABLE = False
     # Create dummy classes for type hints when telegram is not available
     class InlineKeyboardButton:
+        __slots__ = ('text', 'callback_data')
+        
         def __init__(self, text, callback_data):
             self.text = text
             self.callback_data = callback_data
     
     class InlineKeyboardMarkup:
+        __slots__ = ('inline_keyboard',)
+        
         def __init__(self, keyboard):
             self.inline_keyboard = keyboard
 
@@ -44,6 +52,54 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Time of the update being handled, pinned by request_time() so every helper
+# that needs "now" while handling one update shares a single clock read
+_CURRENT_NOW: ContextVar[Optional[datetime]] = ContextVar('current_now', default=None)
+
+
+def current_time() -> datetime:
+    """
+    Get the current time for the update being handled
+    
+    Returns:
+        datetime: Time pinned by request_time(), or datetime.now() outside it
+    """
+    return _CURRENT_NOW.get() or datetime.now()
+
+
+@contextmanager
+def request_time():
+    """Pin current_time() to a single datetime.now() reading for the enclosed block"""
+    token = _CURRENT_NOW.set(datetime.now())
+    try:
+        yield
+    finally:
+        _CURRENT_NOW.reset(token)
+
+
+# Month names for Drive folder names, indexed by month - 1
+_MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+
+# Cancel button closing every sales rep keyboard; buttons are immutable, so one is shared
+_CANCEL_BTN = InlineKeyboardButton(
+    text="❌ Cancel",
+    callback_data="cancel_selection"
+)
+
+
+def _sales_rep_button(rep: Dict[str, Any]) -> InlineKeyboardButton:
+    """Button selecting a sales rep; its callback data carries the user_id"""
+    user_id = rep.get('user_id')
+    name = rep.get('name', f'User {user_id}')
+    return InlineKeyboardButton(
+        text="👤 " + str(name),
+        callback_data="select_user_" + str(user_id)
+    )
+
 
 def create_sales_rep_keyboard(sales_reps: List[Dict[str, Any]]) -> InlineKeyboardMarkup:
     """
@@ -59,28 +115,15 @@ def create_sales_rep_keyboard(sales_reps: List[Dict[str, Any]]) -> InlineKeyboar
         # Return empty keyboard if no sales reps
         return InlineKeyboardMarkup([])
     
-    keyboard = []
-    for rep in sales_reps:
-        user_id = rep.get('user_id')
-        name = rep.get('name', f'User {user_id}')
-        
-        # Create button with callback data containing user_id
-        button = InlineKeyboardButton(
-            text=f"👤 {name}",
-            callback_data=f"select_user_{user_id}"
-        )
-        keyboard.append([button])
+    keyboard = [[_sales_rep_button(rep)] for rep in sales_reps]
     
     # Add cancel button
-    cancel_button = InlineKeyboardButton(
-        text="❌ Cancel",
-        callback_data="cancel_selection"
-    )
-    keyboard.append([cancel_button])
+    keyboard.append([_CANCEL_BTN])
     
     return InlineKeyboardMarkup(keyboard)
 
 
+@functools.lru_cache(maxsize=512)
 def create_confirmation_keyboard(action: str, data: str = "") -> InlineKeyboardMarkup:
     """
     Generate confirmation keyboard for yes/no actions
@@ -90,12 +133,12 @@ def create_confirmation_keyboard(action: str, data: str = "") -> InlineKeyboardM
         data (str): Additional data to include in callback
         
     Returns:
-        InlineKeyboardMarkup: Confirmation keyboard
+        InlineKeyboardMarkup: Confirmation keyboard (cached per action and data; do not modify)
     """
     keyboard = [
         [
-            InlineKeyboardButton("✅ Yes", callback_data=f"confirm_{action}_{data}"),
-            InlineKeyboardButton("❌ No", callback_data=f"cancel_{action}_{data}")
+            InlineKeyboardButton("✅ Yes", callback_data="confirm_" + str(action) + "_" + str(data)),
+            InlineKeyboardButton("❌ No", callback_data="cancel_" + str(action) + "_" + str(data))
         ]
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -111,20 +154,31 @@ def create_menu_keyboard(menu_items: List[Dict[str, str]]) -> InlineKeyboardMark
     Returns:
         InlineKeyboardMarkup: Menu keyboard
     """
-    keyboard = []
-    for item in menu_items:
-        button = InlineKeyboardButton(
-            text=item['text'],
-            callback_data=item['callback_data']
-        )
-        keyboard.append([button])
+    keyboard = [
+        [InlineKeyboardButton(text=item['text'], callback_data=item['callback_data'])]
+        for item in menu_items
+    ]
     
     return InlineKeyboardMarkup(keyboard)
 
 
-def format_progress_bar(current: int, target: int, bar_length: int = 10) -> str:
+# Progress bar status: percentage thresholds and the emoji for each band,
+# lowest first; bisect_right() on the thresholds indexes the emojis
+_STATUS_THRESHOLDS = (25, 50, 75, 100)
+_STATUS_EMOJIS = ("🚀", "📈", "💪", "🔥", "🎉")
+_OVERALL_STATUS = (
+    ("💼", "Just getting started!"),
+    ("📊", "Making progress!"),
+    ("👍", "Good progress!"),
+    ("⭐", "Excellent progress!"),
+    ("🏆", "All targets achieved!"),
+)
+
+
+def _format_progress_bar_and_pct(current: int, target: int,
+                                 bar_length: int = 10) -> Tuple[str, float]:
     """
-    Create visual progress bar with percentage and emojis
+    Build the progress bar string together with its uncapped percentage
     
     Args:
         current (int): Current progress value
@@ -132,17 +186,16 @@ def format_progress_bar(current: int, target: int, bar_length: int = 10) -> str:
         bar_length (int): Length of the progress bar in characters
         
     Returns:
-        str: Formatted progress bar string
+        Tuple[str, float]: Formatted progress bar and raw completion percentage
     """
     if target <= 0:
-        return "🚫 No target set"
-    
-    # Calculate percentage
-    percentage = min((current / target) * 100, 100.0)
+        return "🚫 No target set", 0.0
     
-    # Calculate filled bars
-    filled_bars = int((current / target) * bar_length)
-    filled_bars = min(filled_bars, bar_length)
+    # Calculate percentage and filled bars from one ratio
+    ratio = current / target
+    raw_percentage = ratio * 100
+    percentage = min(raw_percentage, 100.0)
+    filled_bars = min(int(ratio * bar_length), bar_length)
     
     # Create progress bar
     filled = "🟩" * filled_bars
@@ -150,18 +203,24 @@ def format_progress_bar(current: int, target: int, bar_length: int = 10) -> str:
     progress_bar = filled + empty
     
     # Add status emoji
-    if percentage >= 100:
-        status_emoji = "🎉"
-    elif percentage >= 75:
-        status_emoji = "🔥"
-    elif percentage >= 50:
-        status_emoji = "💪"
-    elif percentage >= 25:
-        status_emoji = "📈"
-    else:
-        status_emoji = "🚀"
+    status_emoji = _STATUS_EMOJIS[bisect.bisect_right(_STATUS_THRESHOLDS, percentage)]
+    
+    return f"{status_emoji} {progress_bar} {percentage:.1f}% ({current}/{target})", raw_percentage
+
+
+def format_progress_bar(current: int, target: int, bar_length: int = 10) -> str:
+    """
+    Create visual progress bar with percentage and emojis
     
-    return f"{status_emoji} {progress_bar} {percentage:.1f}% ({current}/{target})"
+    Args:
+        current (int): Current progress value
+        target (int): Target value
+        bar_length (int): Length of the progress bar in characters
+        
+    Returns:
+        str: Formatted progress bar string
+    """
+    return _format_progress_bar_and_pct(current, target, bar_length)[0]
 
 
 def format_progress_summary(meetup_current: int, meetup_target: int, 
@@ -178,29 +237,16 @@ def format_progress_summary(meetup_current: int, meetup_target: int,
     Returns:
         str: Formatted progress summary
     """
-    meetup_bar = format_progress_bar(meetup_current, meetup_target)
+    meetup_bar, meetup_pct = _format_progress_bar_and_pct(meetup_current, meetup_target)
     sales_bar = format_progress_bar(int(sales_current), int(sales_target))
     
-    # Overall completion
-    meetup_pct = (meetup_current / meetup_target * 100) if meetup_target > 0 else 0
+    # Overall completion (sales uses the unrounded amounts)
     sales_pct = (sales_current / sales_target * 100) if sales_target > 0 else 0
     overall_pct = (meetup_pct + sales_pct) / 2
     
-    if overall_pct >= 100:
-        overall_emoji = "🏆"
-        overall_status = "All targets achieved!"
-    elif overall_pct >= 75:
-        overall_emoji = "⭐"
-        overall_status = "Excellent progress!"
-    elif overall_pct >= 50:
-        overall_emoji = "👍"
-        overall_status = "Good progress!"
-    elif overall_pct >= 25:
-        overall_emoji = "📊"
-        overall_status = "Making progress!"
-    else:
-        overall_emoji = "💼"
-        overall_status = "Just getting started!"
+    overall_emoji, overall_status = _OVERALL_STATUS[
+        bisect.bisect_right(_STATUS_THRESHOLDS, overall_pct)
+    ]
     
     return f"""📊 **KPI Progress Summary**
 
@@ -221,18 +267,11 @@ def get_current_month_folder() -> str:
     Returns:
         str: Formatted month folder name
     """
-    now = datetime.now()
-    month_names = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    
-    month_num = now.month
-    month_name = month_names[month_num - 1]
-    
-    return f"{month_num:02d}_{month_name}"
+    now = current_time()
+    return get_month_folder(now.year, now.month)
 
 
+@functools.lru_cache(maxsize=256)
 def get_month_folder(year: int, month: int) -> str:
     """
     Generate month folder name for specific year and month
@@ -251,13 +290,7 @@ def get_month_folder(year: int, month: int) -> str:
     if not (1 <= month <= 12):
         raise ValueError("Month must be between 1 and 12")
     
-    month_names = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    
-    month_name = month_names[month - 1]
-    return f"{month:02d}_{month_name}"
+    return f"{month:02d}_{_MONTH_NAMES[month - 1]}"
 
 
 def get_year_month_path(year: int, month: int) -> str:
@@ -272,8 +305,31 @@ def get_year_month_path(year: int, month: int) -> str:
     Returns:
         str: Full year/month path
     """
-    month_folder = get_month_folder(year, month)
-    return f"{year}/{month_folder}"
+    return f"{year}/{get_month_folder(year, month)}"
+
+
+# Message emojis by action / error type, with a 'default' fallback
+_SUCCESS_EMOJIS = {
+    'registration': '🎉',
+    'kpi_submission': '✅',
+    'target_setting': '🎯',
+    'photo_upload': '📸',
+    'data_save': '💾',
+    'update': '🔄',
+    'delete': '🗑️',
+    'default': '✅'
+}
+_ERROR_EMOJIS = {
+    'validation': '⚠️',
+    'permission': '🚫',
+    'network': '🌐',
+    'upload': '📤',
+    'not_found': '🔍',
+    'timeout': '⏰',
+    'rate_limit': '⏳',
+    'default': '❌'
+}
+_ERROR_TRAILER = "\n\n🔄 Please try again or contact support if the problem persists."
 
 
 def format_success_message(action: str, next_step: Optional[str] = None) -> str:
@@ -287,18 +343,7 @@ def format_success_message(action: str, next_step: Optional[str] = None) -> str:
     Returns:
         str: Formatted success message
     """
-    success_emojis = {
-        'registration': '🎉',
-        'kpi_submission': '✅',
-        'target_setting': '🎯',
-        'photo_upload': '📸',
-        'data_save': '💾',
-        'update': '🔄',
-        'delete': '🗑️',
-        'default': '✅'
-    }
-    
-    emoji = success_emojis.get(action.lower(), success_emojis['default'])
+    emoji = _SUCCESS_EMOJIS.get(action.lower(), _SUCCESS_EMOJIS['default'])
     
     message = f"{emoji} **Success!** {action.replace('_', ' ').title()} completed successfully."
     
@@ -324,25 +369,14 @@ def format_error_message(error_type: str, details: Optional[str] = None) -> str:
         return error_format_message(error_type, details)
     
     # Fallback implementation
-    error_emojis = {
-        'validation': '⚠️',
-        'permission': '🚫',
-        'network': '🌐',
-        'upload': '📤',
-        'not_found': '🔍',
-        'timeout': '⏰',
-        'rate_limit': '⏳',
-        'default': '❌'
-    }
-    
-    emoji = error_emojis.get(error_type.lower(), error_emojis['default'])
+    emoji = _ERROR_EMOJIS.get(error_type.lower(), _ERROR_EMOJIS['default'])
     
     message = f"{emoji} **Error:** {error_type.replace('_', ' ').title()}"
     
     if details:
         message += f"\n{details}"
     
-    message += "\n\n🔄 Please try again or contact support if the problem persists."
+    message += _ERROR_TRAILER
     
     return message
 
@@ -405,10 +439,10 @@ def validate_callback_data(callback_data: str, expected_prefix: str) -> bool:
     Returns:
         bool: True if valid format
     """
-    if not callback_data or not isinstance(callback_data, str):
-        return False
-    
-    return callback_data.startswith(expected_prefix)
+    # Telegram delivers callback data as str; None (no data) or other objects are invalid
+    if type(callback_data) is str:
+        return callback_data != "" and callback_data.startswith(expected_prefix)
+    return False
 
 
 def extract_user_id_from_callback(callback_data: str) -> Optional[int]:
@@ -422,16 +456,21 @@ def extract_user_id_from_callback(callback_data: str) -> Optional[int]:
     Returns:
         Optional[int]: User ID if found, None otherwise
     """
-    try:
-        parts = callback_data.split('_')
-        if len(parts) >= 3 and parts[-2] == 'user':
-            return int(parts[-1])
-    except (ValueError, IndexError):
-        logger.warning(f"Failed to extract user ID from callback data: {callback_data}")
+    rest, _, user_id = callback_data.rpartition('_')
+    _, sep, marker = rest.rpartition('_')
+    if sep and marker == 'user':
+        try:
+            return int(user_id)
+        except ValueError:
+            logger.warning(f"Failed to extract user ID from callback data: {callback_data}")
     
     return None
 
 
+# Characters not allowed in stored filenames, each mapped to '_'
+_FILENAME_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename for safe storage
@@ -442,14 +481,14 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename
     """
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
+    # Replace invalid characters in a single pass
+    filename = filename.translate(_FILENAME_TRANS)
     
     # Limit length
     if len(filename) > 100:
-        name, ext = filename.rsplit('.', 1) if '.' in filename else (filename, '')
+        name, dot, ext = filename.rpartition('.')
+        if not dot:
+            name, ext = ext, ''
         filename = name[:95] + ('.' + ext if ext else '')
     
     return filename
@@ -462,33 +501,48 @@ def generate_photo_filename(user_id: int, record_type: str, timestamp: Optional[
     Args:
         user_id (int): User ID
         record_type (str): Type of record ('meetup' or 'sale')
-        timestamp (datetime, optional): Timestamp for filename
+        timestamp (datetime, optional): Timestamp for filename (default: current_time())
         
     Returns:
         str: Generated filename
     """
     if timestamp is None:
-        timestamp = datetime.now()
+        timestamp = current_time()
     
-    timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
-    return f"{record_type}_{user_id}_{timestamp_str}.jpg"
+    # Equivalent to strftime("%Y%m%d_%H%M%S") without the locale-aware formatter
+    return (
+        f"{record_type}_{user_id}_"
+        f"{timestamp.year:04d}{timestamp.month:02d}{timestamp.day:02d}_"
+        f"{timestamp.hour:02d}{timestamp.minute:02d}{timestamp.second:02d}.jpg"
+    )
 
 
-def format_datetime_display(dt: datetime, include_time: bool = True) -> str:
+def format_datetime_display(dt: Optional[datetime] = None, include_time: bool = True) -> str:
     """
     Format datetime for display in messages
     
     Args:
-        dt (datetime): Datetime to format
+        dt (datetime, optional): Datetime to format (default: current_time())
         include_time (bool): Whether to include time
         
     Returns:
         str: Formatted datetime string
     """
-    if include_time:
-        return dt.strftime("%B %d, %Y at %I:%M %p")
-    else:
-        return dt.strftime("%B %d, %Y")
+    if dt is None:
+        dt = current_time()
+    
+    # Same output as strftime("%B %d, %Y at %I:%M %p") in the C locale
+    date_str = f"{_MONTH_NAMES[dt.month - 1]} {dt.day:02d}, {dt.year}"
+    if not include_time:
+        return date_str
+    
+    hour = dt.hour
+    return f"{date_str} at {(hour - 1) % 12 + 1:02d}:{dt.minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+# Greeting emoji for each hour of the day (index 0-23): night until 5,
+# morning until 12, afternoon until 17, evening until 21
+_HOUR_EMOJI = ("🌙",) * 5 + ("🌅",) * 7 + ("☀️",) * 5 + ("🌆",) * 4 + ("🌙",) * 3
 
 
 def get_greeting_emoji() -> str:
@@ -498,13 +552,4 @@ def get_greeting_emoji() -> str:
     Returns:
         str: Greeting emoji
     """
-    hour = datetime.now().hour
-    
-    if 5 <= hour < 12:
-        return "🌅"  # Morning
-    elif 12 <= hour < 17:
-        return "☀️"  # Afternoon
-    elif 17 <= hour < 21:
-        return "🌆"  # Evening
-    else:
-        return "🌙"  # Night
\ No newline at end of file
+    return _HOUR_EMOJI[current_time().hour]
\ No newline at end of file